@@ -0,0 +1,156 @@
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import timeit
+
+import numpy as np
+
+from Shot_physics import HEIGHT, RIM_Y, RIM_VERTICAL_OFFSET, SCORE_Y, simulate_shots
+from Test_model import AutoGame
+
+REPEATS = 5
+DEFAULT_TOLERANCE = 0.5
+
+
+def time_call(fn, repeats=REPEATS):
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    runs = [total / number for total in timer.repeat(repeats, number)]
+    return {
+        'median_us': statistics.median(runs) * 1e6,
+        'min_us': min(runs) * 1e6,
+        'loops': number,
+        'repeats': repeats,
+    }
+
+
+def build_benchmarks(game):
+    rim_collision_y = RIM_Y + RIM_VERTICAL_OFFSET
+
+    def trajectory():
+        for _ in game.calculate_trajectory(80, math.radians(55), 100, HEIGHT - 100):
+            pass
+
+    def rim_collision():
+        game.check_rim_collision(game.rim_x - 60, rim_collision_y - 30, game.rim_x - 40, rim_collision_y - 10, (200, -200))
+
+    def basket_score():
+        game.basket_scored_this_chance = False
+        game.prev_positions.clear()
+        game.prev_positions.append((game.rim_x, SCORE_Y - 5))
+        game.check_basket_score(game.rim_x, SCORE_Y + 5)
+
+    def auto_shoot():
+        game.auto_shoot()
+
+    def frame():
+        if not game.arrow_in_motion:
+            game.auto_shoot()
+        game.update()
+        game.draw(0.5)
+
+    def full_redraw_frame():
+        game.renderer.invalidate()
+        frame()
+
+    def headless_game():
+        game.reset_game()
+        games_played = game.games_played
+        while game.games_played == games_played:
+            game.update()
+
+    rng = np.random.default_rng(0)
+    speeds, angles, rims = rng.uniform(40, 105, 10000), rng.uniform(20, 85, 10000), rng.integers(200, 601, 10000)
+
+    def batch_10k():
+        simulate_shots(speeds, angles, rims)
+
+    return {
+        'calculate_trajectory': trajectory,
+        'check_rim_collision': rim_collision,
+        'check_basket_score': basket_score,
+        'auto_shoot': auto_shoot,
+        'render_frame': frame,
+        'render_frame_full_redraw': full_redraw_frame,
+        'headless_game_15_shots': headless_game,
+        'simulate_shots_10k': batch_10k,
+    }
+
+
+def run_benchmarks(model_file, names=None):
+    game = AutoGame(turbo=True, games=sys.maxsize, model_file=model_file)
+    game.rim_x = 400
+    benchmarks = build_benchmarks(game)
+    results = {}
+    for name, fn in benchmarks.items():
+        if names and name not in names:
+            continue
+        # Turbo games print a line per finished game; keep it out of the report.
+        with contextlib.redirect_stdout(io.StringIO()):
+            results[name] = time_call(fn)
+        print(f"{name:<28} {results[name]['median_us']:>12.1f} us")
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'numpy': np.__version__,
+        'benchmarks': results,
+    }
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    for name, result in results['benchmarks'].items():
+        reference = baseline['benchmarks'].get(name)
+        if reference is None:
+            continue
+        ratio = result['median_us'] / reference['median_us']
+        status = 'REGRESSION' if ratio > 1 + tolerance else 'ok'
+        print(f"{name:<28} {reference['median_us']:>12.1f} -> {result['median_us']:>12.1f} us  x{ratio:.2f}  {status}")
+        if status != 'ok':
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="Time the physics, collision, inference and rendering hot paths.")
+    parser.add_argument('--model', default=os.path.join(script_dir, 'teams', 'SUNSHINE.json'))
+    parser.add_argument('--output', help="write results as JSON to this file")
+    parser.add_argument('--baseline', default=os.path.join(script_dir, 'benchmark_baseline.json'))
+    parser.add_argument('--save-baseline', action='store_true', help="store these results as the new baseline")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed slowdown before a benchmark counts as a regression (0.5 = 50%%)")
+    parser.add_argument('--only', nargs='+', help="run only these benchmarks")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.model, args.only)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Saved baseline to {args.baseline}")
+        return
+
+    if not os.path.isfile(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one")
+        return
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    print()
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import argparse
+import os
+import secrets
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from Shot_log import init_log, append_columns, merge_logs
+from Shot_physics import MAX_POWER, RIM_MIN_X, RIM_MAX_X, simulate_shots
+
+
+def sweep_grid(speed_step, angle_step, angle_min, angle_max):
+    speeds = np.arange(speed_step, MAX_POWER + speed_step / 2, speed_step)
+    angles = np.arange(angle_min, angle_max + angle_step / 2, angle_step)
+    return np.meshgrid(speeds, angles, indexing='ij')
+
+
+def generate_shard(rim_positions, speed_step, angle_step, angle_min, angle_max, session, shard_path):
+    speed, angle = sweep_grid(speed_step, angle_step, angle_min, angle_max)
+    speed, angle = speed.ravel(), angle.ravel()
+    init_log(shard_path)
+    made_shots = 0
+    for rim_x in rim_positions:
+        made, collision = simulate_shots(speed, angle, rim_x)
+        made_shots += append_columns(shard_path, {'speed': speed[made], 'angle': angle[made], 'rim_x': rim_x,
+                                                  'made': True, 'collision': collision[made],
+                                                  'session': session, 'timestamp': time.time()})
+    return shard_path, made_shots
+
+
+def main():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="Generate training shots by sweeping speed and angle for every rim position.")
+    parser.add_argument('--output', default=os.path.join(script_dir, 'shots'), help="shot log directory")
+    parser.add_argument('--speed-step', type=float, default=0.5)
+    parser.add_argument('--angle-step', type=float, default=0.5)
+    parser.add_argument('--angle-min', type=float, default=0)
+    parser.add_argument('--angle-max', type=float, default=90)
+    parser.add_argument('--rim-step', type=int, default=1)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    rim_positions = list(range(RIM_MIN_X, RIM_MAX_X + 1, args.rim_step))
+    chunks = [rim_positions[i::args.workers * 4] for i in range(min(len(rim_positions), args.workers * 4))]
+    session = secrets.randbits(64)
+    shard_dir = tempfile.mkdtemp(prefix='shots-', dir=os.path.dirname(os.path.abspath(args.output)))
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            futures = [pool.submit(generate_shard, chunk, args.speed_step, args.angle_step, args.angle_min,
+                                   args.angle_max, session, os.path.join(shard_dir, f'shard-{i:04d}'))
+                       for i, chunk in enumerate(chunks)]
+            results = [future.result() for future in futures]
+        merge_logs(args.output, [path for path, _ in results])
+    finally:
+        shutil.rmtree(shard_dir, ignore_errors=True)
+
+    total = sum(count for _, count in results)
+    print(f"Wrote {total} made shots for {len(rim_positions)} rim positions to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+import argparse
+import asyncio
+import json
+import os
+import socket
+import tempfile
+import time
+
+import numpy as np
+
+from Poly_model import load_model
+from Tournament import find_models, report_unconverted, unconverted_models
+
+DEFAULT_ADDRESS = os.path.join(tempfile.gettempdir(), 'basketball-inference.sock')
+BATCH_WINDOW = 0.001
+MAX_BATCH = 4096
+RELOAD_INTERVAL = 1.0
+CLIENT_TIMEOUT = 1.0
+# Every model predicts (speed, angle).
+PREDICTION_COLUMNS = 2
+
+
+def parse_address(address):
+    # "host:port" is TCP; anything else is a Unix socket path.
+    host, _, port = address.rpartition(':')
+    if host and port.isdigit():
+        return host, int(port)
+    return address
+
+
+class ModelStore:
+    def __init__(self, teams_dir):
+        self.teams_dir = teams_dir
+        self.models = {}
+        self.versions = {}
+        self.unconverted = set()
+        self.reload()
+
+    def reload(self):
+        unconverted = unconverted_models(self.teams_dir)
+        report_unconverted(path for path in unconverted if path not in self.unconverted)
+        self.unconverted = set(unconverted)
+        paths = find_models(self.teams_dir)
+        for name in set(self.versions) - set(paths):
+            del self.versions[name]
+            if self.models.pop(name, None) is not None:
+                print(f"Removed {name}")
+        for name, path in paths.items():
+            version = (path, os.stat(path).st_mtime_ns)
+            if self.versions.get(name) == version:
+                continue
+            reloading = name in self.models
+            # A file that fails to load is remembered too, so it is only retried once it changes.
+            self.versions[name] = version
+            try:
+                self.models[name] = load_model(path)
+            except Exception as e:
+                print(f"Could not load {path} ({e.__class__.__name__}: {e})")
+                continue
+            print(f"{'Reloaded' if reloading else 'Loaded'} {name} from {path}")
+
+
+class InferenceServer:
+    def __init__(self, store):
+        self.store = store
+        self.queue = asyncio.Queue()
+        self.requests = 0
+        self.batches = 0
+        self.clients = 0
+
+    async def predict(self, team, rim_x):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((team, rim_x, future))
+        return await future
+
+    async def batch_loop(self):
+        while True:
+            pending = [await self.queue.get()]
+            # Wait a moment for concurrent requests so they share one predict call;
+            # a lone client has nobody to wait for.
+            deadline = time.perf_counter() + (BATCH_WINDOW if self.clients > 1 else 0)
+            while len(pending) < MAX_BATCH:
+                try:
+                    pending.append(self.queue.get_nowait())
+                    continue
+                except asyncio.QueueEmpty:
+                    pass
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    pending.append(await asyncio.wait_for(self.queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            by_team = {}
+            for request in pending:
+                by_team.setdefault(request[0], []).append(request)
+            for team, requests in by_team.items():
+                model = self.store.models.get(team)
+                if model is None:
+                    for _, _, future in requests:
+                        future.set_exception(KeyError(f"unknown team {team!r}"))
+                    continue
+                sizes = [len(rim_x) for _, rim_x, _ in requests]
+                try:
+                    predictions = model.predict(np.concatenate([rim_x for _, rim_x, _ in requests]))
+                except Exception as e:
+                    for _, _, future in requests:
+                        future.set_exception(ValueError(f"{team} failed to predict ({e})"))
+                    continue
+                for (_, _, future), prediction in zip(requests, np.split(predictions, np.cumsum(sizes)[:-1])):
+                    future.set_result(prediction)
+                self.batches += 1
+            self.requests += len(pending)
+
+    async def reload_loop(self):
+        while True:
+            await asyncio.sleep(RELOAD_INTERVAL)
+            self.store.reload()
+
+    async def handle_client(self, reader, writer):
+        self.clients += 1
+        try:
+            while line := await reader.readline():
+                request = json.loads(line)
+                if request.get('op') == 'stats':
+                    response = {'requests': self.requests, 'batches': self.batches, 'teams': sorted(self.store.models)}
+                else:
+                    try:
+                        rim_x = np.asarray(request['rim_x'], dtype=np.float64).reshape(-1)
+                        prediction = await self.predict(request['team'], rim_x)
+                        response = {'prediction': prediction.tolist()}
+                    except (KeyError, ValueError, TypeError) as e:
+                        response = {'error': f"{e.__class__.__name__}: {e}"}
+                response['id'] = request.get('id')
+                writer.write(json.dumps(response).encode() + b'\n')
+                await writer.drain()
+        except (ConnectionError, json.JSONDecodeError):
+            pass
+        finally:
+            self.clients -= 1
+            writer.close()
+
+    async def serve(self, address):
+        address = parse_address(address)
+        if isinstance(address, tuple):
+            server = await asyncio.start_server(self.handle_client, *address)
+        else:
+            if os.path.exists(address):
+                os.remove(address)
+            server = await asyncio.start_unix_server(self.handle_client, address)
+        print(f"Serving {len(self.store.models)} model(s) on {address}")
+        async with server:
+            await asyncio.gather(server.serve_forever(), self.batch_loop(), self.reload_loop())
+
+
+class InferenceClient:
+    def __init__(self, address=DEFAULT_ADDRESS, timeout=CLIENT_TIMEOUT):
+        address = parse_address(address)
+        family = socket.AF_INET if isinstance(address, tuple) else socket.AF_UNIX
+        self.sock = socket.socket(family, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        try:
+            self.sock.connect(address)
+        except OSError:
+            self.sock.close()
+            raise
+        self.file = self.sock.makefile('rwb')
+        self.next_id = 0
+
+    def request(self, data):
+        data['id'] = self.next_id
+        self.next_id += 1
+        self.file.write(json.dumps(data).encode() + b'\n')
+        self.file.flush()
+        line = self.file.readline()
+        if not line:
+            raise ConnectionError("inference server closed the connection")
+        response = json.loads(line)
+        if 'error' in response:
+            raise ValueError(response['error'])
+        return response
+
+    def predict(self, team, rim_x):
+        rim_x = np.asarray(rim_x, dtype=np.float64)
+        response = self.request({'team': team, 'rim_x': rim_x.reshape(-1).tolist()})
+        return np.asarray(response['prediction'], dtype=np.float64).reshape(rim_x.shape + (PREDICTION_COLUMNS,))
+
+    def stats(self):
+        return self.request({'op': 'stats'})
+
+    def close(self):
+        self.file.close()
+        self.sock.close()
+
+
+def main():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="Serve shot predictions for every model in teams/ to local games.")
+    parser.add_argument('--teams', default=os.path.join(script_dir, 'teams'))
+    parser.add_argument('--address', default=DEFAULT_ADDRESS, help="Unix socket path or host:port")
+    args = parser.parse_args()
+
+    server = InferenceServer(ModelStore(args.teams))
+    try:
+        asyncio.run(server.serve(args.address))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from Poly_model import load_model
+from Shot_physics import MAX_POWER, RIM_MIN_X, RIM_MAX_X, simulate_shots
+
+INDEX_FORMAT = 'basketball-make-index'
+INDEX_VERSION = 3
+# The JSON header is padded to a fixed size so the bitmap starts at a page boundary.
+HEADER_SIZE = 4096
+
+
+def index_axes(header):
+    rims = header['rim_min'] + header['rim_step'] * np.arange(header['rim_count'])
+    speeds = header['speed_step'] * np.arange(header['speed_count'])
+    angles = header['angle_step'] * np.arange(header['angle_count'])
+    return rims, speeds, angles
+
+
+def bitmap_shape(header):
+    return header['rim_count'], header['speed_count'], (header['angle_count'] + 7) // 8
+
+
+def build_rows(path, header, rim_indices):
+    rims, speeds, angles = index_axes(header)
+    bitmap = np.memmap(path, dtype=np.uint8, mode='r+', offset=HEADER_SIZE, shape=bitmap_shape(header))
+    for i in rim_indices:
+        made, _ = simulate_shots(speeds[:, None], angles[None, :], rims[i])
+        bitmap[i] = np.packbits(made, axis=-1, bitorder='little')
+    bitmap.flush()
+    return len(rim_indices)
+
+
+def build_index(path, speed_step=0.5, angle_step=0.5, rim_step=1, workers=None):
+    workers = workers or os.cpu_count()
+    header = {
+        'format': INDEX_FORMAT,
+        'version': INDEX_VERSION,
+        'rim_min': RIM_MIN_X,
+        'rim_step': rim_step,
+        'rim_count': (RIM_MAX_X - RIM_MIN_X) // rim_step + 1,
+        'speed_step': speed_step,
+        'speed_count': int(MAX_POWER / speed_step) + 1,
+        'angle_step': angle_step,
+        'angle_count': int(round(360 / angle_step)),
+    }
+    encoded = json.dumps(header).encode()
+    tmp_path = path + f'.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(encoded.ljust(HEADER_SIZE, b' '))
+        f.truncate(HEADER_SIZE + int(np.prod(bitmap_shape(header))))
+    try:
+        # Workers write their rim rows straight into the file instead of sending them back.
+        chunks = [range(i, header['rim_count'], workers * 4) for i in range(min(header['rim_count'], workers * 4))]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for future in [pool.submit(build_rows, tmp_path, header, chunk) for chunk in chunks]:
+                future.result()
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    return MakeIndex(path)
+
+
+class MakeIndex:
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            header = json.loads(f.read(HEADER_SIZE))
+        if header.get('format') != INDEX_FORMAT or header.get('version') != INDEX_VERSION:
+            raise ValueError(f"{path} is not a version {INDEX_VERSION} make index")
+        self.header = header
+        self.rims, self.speeds, self.angles = index_axes(header)
+        self.bitmap = np.memmap(path, dtype=np.uint8, mode='r', offset=HEADER_SIZE, shape=bitmap_shape(header))
+
+    def cell(self, rim_x, speed, angle):
+        h = self.header
+        rim = np.rint((np.asarray(rim_x, dtype=float) - h['rim_min']) / h['rim_step']).astype(np.int64)
+        speed = np.rint(np.asarray(speed, dtype=float) / h['speed_step']).astype(np.int64)
+        angle = np.rint(np.mod(angle, 360) / h['angle_step']).astype(np.int64) % h['angle_count']
+        inside = (rim >= 0) & (rim < h['rim_count']) & (speed >= 0) & (speed < h['speed_count'])
+        return tuple(np.broadcast_arrays(np.where(inside, rim, 0), np.where(inside, speed, 0), angle, inside))
+
+    def made(self, rim_x, speed, angle):
+        rim, speed, angle, inside = self.cell(rim_x, speed, angle)
+        bits = (self.bitmap[rim, speed, angle >> 3] >> (angle & 7)) & 1
+        return inside & bits.astype(bool)
+
+    def row(self, rim, speed):
+        return np.unpackbits(self.bitmap[rim, speed], bitorder='little')[:self.header['angle_count']].astype(bool)
+
+    def made_angles(self, rim_x, speed):
+        rim, speed, _, inside = self.cell(rim_x, speed, 0)
+        if not inside:
+            return self.angles[:0]
+        return self.angles[self.row(rim, speed)]
+
+    def margin(self, rim_x, speed, angle):
+        # How far the shot can move along the speed and angle axes and still score, in game units.
+        shape = np.broadcast(np.asarray(rim_x), np.asarray(speed), np.asarray(angle)).shape
+        rim, speed, angle, inside = (np.ravel(a) for a in self.cell(rim_x, speed, angle))
+        speed_margin, angle_margin = np.zeros(rim.shape), np.zeros(rim.shape)
+        for i in np.flatnonzero(inside):
+            row = self.row(rim[i], speed[i])
+            if not row[angle[i]]:
+                continue
+            # Angles wrap, so walk the row rolled to put this shot in the middle.
+            rolled = np.roll(row, len(row) // 2 - angle[i])
+            misses = np.flatnonzero(~rolled)
+            angle_margin[i] = np.min(np.abs(misses - len(row) // 2)) if misses.size else len(row) // 2
+            column = np.unpackbits(self.bitmap[rim[i], :, angle[i] >> 3, None], axis=1,
+                                   bitorder='little')[:, angle[i] & 7].astype(bool)
+            misses = np.flatnonzero(~column)
+            # Off either end of the speed axis counts as a miss.
+            misses = np.concatenate([[-1, len(column)], misses])
+            speed_margin[i] = np.min(np.abs(misses - speed[i]))
+        # The nearest miss is one step past the last made cell.
+        return ((np.maximum(speed_margin - 1, 0) * self.header['speed_step']).reshape(shape),
+                (np.maximum(angle_margin - 1, 0) * self.header['angle_step']).reshape(shape))
+
+
+def main():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="Build or query the bit-packed (rim_x, speed, angle) make index.")
+    parser.add_argument('--index', default=os.path.join(script_dir, 'make_index.bin'))
+    parser.add_argument('--build', action='store_true', help="sweep every rim position, speed and angle")
+    parser.add_argument('--speed-step', type=float, default=0.5)
+    parser.add_argument('--angle-step', type=float, default=0.5)
+    parser.add_argument('--rim-step', type=int, default=1)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--rim', type=float, help="list the angles that score at this rim position and --speed")
+    parser.add_argument('--speed', type=float)
+    parser.add_argument('--model', help="report the margin of error around a model's shot at every rim position")
+    args = parser.parse_args()
+
+    if args.build:
+        index = build_index(args.index, args.speed_step, args.angle_step, args.rim_step, args.workers)
+        made = sum(int(np.unpackbits(rows).sum()) for rows in index.bitmap)
+        print(f"Indexed {index.bitmap.shape[0]} rims x {index.bitmap.shape[1]} speeds x "
+              f"{index.header['angle_count']} angles ({made} made) -> {args.index}")
+    index = MakeIndex(args.index)
+
+    if args.rim is not None:
+        if args.speed is None:
+            parser.error("--rim needs --speed")
+        angles = index.made_angles(args.rim, args.speed)
+        print(f"rim {args.rim:g}, speed {args.speed:g}: " +
+              (", ".join(f"{a:g}" for a in angles) if angles.size else "no scoring angle"))
+
+    if args.model:
+        rims = index.rims
+        speed, angle = load_model(args.model).predict(rims).T
+        made = index.made(rims, speed, angle)
+        speed_margin, angle_margin = index.margin(rims, speed, angle)
+        print(f"{int(made.sum())} / {len(rims)} rim positions score")
+        if made.any():
+            print(f"median margin on made shots: speed +/- {np.median(speed_margin[made]):g}, "
+                  f"angle +/- {np.median(angle_margin[made]):g}")
+
+
+if __name__ == "__main__":
+    main()
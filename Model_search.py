@@ -0,0 +1,77 @@
+import argparse
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from Shot_physics import RIM_MIN_X, RIM_MAX_X, simulate_shots
+from Train_model import NormalEquations, CHUNK_SIZE
+
+RIM_POSITIONS = np.arange(RIM_MIN_X, RIM_MAX_X + 1)
+
+
+def candidate_grid(degrees, ridges, per_target=True):
+    if per_target:
+        degree_pairs = itertools.product(degrees, degrees)
+    else:
+        degree_pairs = ((degree, degree) for degree in degrees)
+    return [(pair, ridge) for pair in degree_pairs for ridge in ridges]
+
+
+def score_candidates(state, candidates):
+    results = []
+    for degrees, ridge in candidates:
+        model = state.solve(degrees, ridge)
+        speed, angle = model.predict(RIM_POSITIONS).T
+        made, _ = simulate_shots(speed, angle, RIM_POSITIONS)
+        results.append({'degrees': degrees, 'ridge': ridge, 'made': int(made.sum()),
+                        'make_pct': 100 * made.mean(), 'model': model})
+    return results
+
+
+def search(state, candidates, workers=None):
+    workers = workers or os.cpu_count()
+    # A few batches per worker keeps every core busy without pickling the state per candidate.
+    batches = [candidates[i::workers * 4] for i in range(min(len(candidates), workers * 4))]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(score_candidates, state, batch) for batch in batches]
+        results = [result for future in futures for result in future.result()]
+    # Ties go to the simpler, more regularised model.
+    return sorted(results, key=lambda r: (-r['made'], sum(r['degrees']), -r['ridge']))
+
+
+def main():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="Search polynomial degrees and ridge strengths for the model that "
+                                                 "makes the most baskets across every rim position.")
+    parser.add_argument('--log', default=os.path.join(script_dir, 'shots'))
+    parser.add_argument('--output', default='model.json')
+    parser.add_argument('--degrees', type=int, nargs='+', default=[1, 2, 3, 4, 5, 6])
+    parser.add_argument('--ridges', type=float, nargs='+', default=[0.0, 1e-3, 1e-2, 1e-1, 1.0, 10.0])
+    parser.add_argument('--same-degree', action='store_true', help="use one degree for both speed and angle")
+    parser.add_argument('--include-misses', action='store_true', help="train on missed shots as well")
+    parser.add_argument('--top', type=int, default=10, help="number of candidates to list")
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    # Lower degrees are leading sub-blocks of the max-degree normal equations, so one pass serves every candidate.
+    state = NormalEquations(max(args.degrees), not args.include_misses)
+    state.consume_log(args.log, CHUNK_SIZE)
+    if state.count <= max(args.degrees):
+        parser.error(f"only {state.count} training shots; need more than {max(args.degrees)}")
+
+    candidates = candidate_grid(args.degrees, args.ridges, not args.same_degree)
+    results = search(state, candidates, args.workers)
+
+    print(f"{'#':>3}  {'Speed deg':>9} {'Angle deg':>9} {'Ridge':>8} {'Made':>11} {'Make %':>8}")
+    for rank, r in enumerate(results[:args.top], 1):
+        print(f"{rank:>3}  {r['degrees'][0]:>9} {r['degrees'][1]:>9} {r['ridge']:>8g} "
+              f"{r['made']:>4} / {len(RIM_POSITIONS):<4} {r['make_pct']:>7.1f}%")
+    best = results[0]
+    best['model'].save(args.output)
+    print(f"Saved best of {len(results)} candidates to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import argparse
+import json
+import os
+import pickle
+
+import numpy as np
+
+MODEL_FORMAT = 'basketball-poly-model'
+MODEL_VERSION = 1
+
+
+class PolyModel:
+    def __init__(self, coefficients, x_offset=0.0, x_scale=1.0, outputs=('Speed', 'Angle')):
+        self.coefficients = np.atleast_2d(np.asarray(coefficients, dtype=np.float64))
+        self.x_offset = float(x_offset)
+        self.x_scale = float(x_scale)
+        self.outputs = tuple(outputs)
+        if len(self.outputs) != len(self.coefficients):
+            raise ValueError(f"{len(self.coefficients)} coefficient rows for outputs {self.outputs}")
+
+    @property
+    def degree(self):
+        return self.coefficients.shape[1] - 1
+
+    def predict(self, rim_x):
+        x = (np.asarray(rim_x, dtype=np.float64) - self.x_offset) / self.x_scale
+        result = np.zeros(x.shape + (len(self.outputs),))
+        for power in range(self.degree, -1, -1):
+            result = result * x[..., None] + self.coefficients[:, power]
+        return result
+
+    def to_dict(self):
+        return {
+            'format': MODEL_FORMAT,
+            'version': MODEL_VERSION,
+            'input': 'Rim_Center_X',
+            'outputs': list(self.outputs),
+            'x_offset': self.x_offset,
+            'x_scale': self.x_scale,
+            'coefficients': self.coefficients.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        if data.get('format') != MODEL_FORMAT or data.get('version') != MODEL_VERSION:
+            raise ValueError(f"unsupported model format {data.get('format')!r} version {data.get('version')!r}")
+        return cls(data['coefficients'], data['x_offset'], data['x_scale'], data['outputs'])
+
+    def save(self, path):
+        tmp_path = path + f'.{os.getpid()}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def from_sklearn(cls, model, poly):
+        if poly.n_features_in_ != 1:
+            raise ValueError(f"expected a single Rim_Center_X feature, got {poly.n_features_in_}")
+        powers = poly.powers_[:, 0]
+        coef = np.atleast_2d(model.coef_)
+        coefficients = np.zeros((coef.shape[0], powers.max() + 1))
+        for column, power in enumerate(powers):
+            coefficients[:, power] += coef[:, column]
+        coefficients[:, 0] += model.intercept_
+        return cls(coefficients)
+
+
+def load_model(path):
+    if path.endswith('.pkl'):
+        # Legacy sklearn pickles; unpickling them is what pulls in scikit-learn.
+        with open(path, 'rb') as f:
+            model_data = pickle.load(f)
+        return PolyModel.from_sklearn(model_data['model'], model_data['poly'])
+    with open(path) as f:
+        return PolyModel.from_dict(json.load(f))
+
+
+def convert(pkl_path):
+    json_path = os.path.splitext(pkl_path)[0] + '.json'
+    load_model(pkl_path).save(json_path)
+    return json_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert pickled sklearn models to the NumPy-only JSON format.")
+    parser.add_argument('models', nargs='+', help="pickled model files, e.g. teams/*.pkl")
+    args = parser.parse_args()
+    for pkl_path in args.models:
+        try:
+            print(f"{pkl_path} -> {convert(pkl_path)}")
+        except Exception as e:
+            print(f"{pkl_path}: skipped ({e.__class__.__name__}: {e})")
+
+
+if __name__ == "__main__":
+    main()
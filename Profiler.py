@@ -0,0 +1,119 @@
+import json
+import os
+import time
+from collections import deque
+
+import numpy as np
+
+PROFILE_ENV = 'BASKETBALL_PROFILE'
+DEFAULT_REPORT = 'profile_report.json'
+WINDOW = 600
+OVERLAY_INTERVAL = 0.5
+OVERLAY_FONT_SIZE = 20
+PERCENTILES = (50, 95, 99)
+
+
+class NullProfiler:
+    def begin_frame(self):
+        pass
+
+    def mark(self, phase):
+        pass
+
+    def end_frame(self):
+        pass
+
+    def draw_overlay(self, renderer, screen):
+        pass
+
+    def close(self):
+        pass
+
+
+class FrameProfiler:
+    def __init__(self, report_path=None, overlay=True, window=WINDOW):
+        self.report_path = report_path
+        self.overlay = overlay
+        self.window = window
+        # Rolling samples feed the overlay; the session samples feed the report.
+        self.recent = {}
+        self.session = {}
+        self.frame = {}
+        self.started = time.perf_counter()
+        self.frame_start = self.last = self.started
+        self.overlay_lines = []
+        self.overlay_updated = 0.0
+        self.font = None
+
+    def begin_frame(self):
+        self.frame_start = self.last = time.perf_counter()
+        self.frame.clear()
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.frame[phase] = self.frame.get(phase, 0.0) + now - self.last
+        self.last = now
+
+    def end_frame(self):
+        self.frame['frame'] = self.last - self.frame_start
+        for phase, seconds in self.frame.items():
+            if phase not in self.recent:
+                self.recent[phase] = deque(maxlen=self.window)
+                self.session[phase] = []
+            self.recent[phase].append(seconds)
+            self.session[phase].append(seconds)
+
+    def percentiles(self, samples):
+        return np.percentile(np.fromiter(samples, dtype=float, count=len(samples)), PERCENTILES) * 1000
+
+    def draw_overlay(self, renderer, screen):
+        if not self.overlay or 'frame' not in self.recent:
+            return
+        now = time.perf_counter()
+        if now - self.overlay_updated >= OVERLAY_INTERVAL:
+            # Text only changes twice a second so the renderer can reuse its cached surfaces.
+            frames = self.recent['frame']
+            lines = [f"FPS {len(frames) / sum(frames):5.1f}   ms p50 / p95 / p99"]
+            for phase, samples in self.recent.items():
+                if phase != 'frame':
+                    lines.append(f"{phase:<8} " + " / ".join(f"{ms:6.2f}" for ms in self.percentiles(samples)))
+            self.overlay_lines = lines
+            self.overlay_updated = now
+        if self.font is None:
+            import pygame
+            self.font = pygame.font.SysFont('monospace', OVERLAY_FONT_SIZE)
+        # Bottom right, clear of the ball's launch spot and the score text.
+        surfaces = [renderer.text(self.font, line, (255, 255, 0)) for line in self.overlay_lines]
+        x = screen.get_width() - 10 - max(surface.get_width() for surface in surfaces)
+        y = screen.get_height() - 10 - OVERLAY_FONT_SIZE * len(surfaces)
+        for i, surface in enumerate(surfaces):
+            renderer.draw(f'profile-{i}', surface, surface.get_rect(topleft=(x, y + i * OVERLAY_FONT_SIZE)))
+
+    def report(self):
+        phases = {}
+        for phase, samples in self.session.items():
+            data = np.asarray(samples)
+            p50, p95, p99 = self.percentiles(samples)
+            phases[phase] = {'count': len(data), 'total_s': float(data.sum()), 'mean_ms': float(data.mean() * 1000),
+                             'p50_ms': float(p50), 'p95_ms': float(p95), 'p99_ms': float(p99),
+                             'max_ms': float(data.max() * 1000)}
+        frames = len(self.session.get('frame', ()))
+        return {'frames': frames, 'duration_s': time.perf_counter() - self.started, 'phases': phases}
+
+    def close(self):
+        if not self.report_path or 'frame' not in self.session:
+            return
+        with open(self.report_path, 'w') as f:
+            json.dump(self.report(), f, indent=2)
+        print(f"Profile report written to {self.report_path}")
+
+
+def create_profiler(report_path=None, overlay=True):
+    # report_path comes from --profile; without it the BASKETBALL_PROFILE variable decides.
+    if report_path is None:
+        report_path = os.environ.get(PROFILE_ENV, '')
+        if report_path.lower() in ('', '0', 'false', 'no', 'off'):
+            return NullProfiler()
+        if report_path.lower() in ('1', 'true', 'yes', 'on'):
+            report_path = DEFAULT_REPORT
+    return FrameProfiler(report_path, overlay)
@@ -0,0 +1,85 @@
+import pygame
+
+TEXT_CACHE_SIZE = 256
+DOT_RADIUS = 2
+
+
+def merge_rects(rects):
+    merged = []
+    for rect in rects:
+        if not (rect.width and rect.height):
+            continue
+        rect = rect.copy()
+        index = rect.collidelist(merged)
+        while index != -1:
+            rect.union_ip(merged.pop(index))
+            index = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
+
+
+class Renderer:
+    def __init__(self, screen, background):
+        self.screen = screen
+        self.background = background
+        self.text_cache = {}
+        self.trajectory_cache = None
+        self.drawn = {}
+        self.frame = {}
+        self.full_redraw = True
+
+    def text(self, font, text, color):
+        key = (font, text, color)
+        surface = self.text_cache.get(key)
+        if surface is None:
+            if len(self.text_cache) >= TEXT_CACHE_SIZE:
+                self.text_cache.clear()
+            surface = self.text_cache[key] = font.render(text, True, color)
+        return surface
+
+    def trajectory(self, points, color):
+        key = (tuple(points), color)
+        if self.trajectory_cache is None or self.trajectory_cache[0] != key:
+            xs = [int(x) for x, _ in points]
+            ys = [int(y) for _, y in points]
+            rect = pygame.Rect(min(xs) - DOT_RADIUS, min(ys) - DOT_RADIUS,
+                               max(xs) - min(xs) + 2 * DOT_RADIUS + 1, max(ys) - min(ys) + 2 * DOT_RADIUS + 1)
+            surface = pygame.Surface(rect.size, pygame.SRCALPHA)
+            for x, y in zip(xs, ys):
+                pygame.draw.circle(surface, color, (x - rect.x, y - rect.y), DOT_RADIUS)
+            self.trajectory_cache = (key, surface, rect)
+        return self.trajectory_cache[1], self.trajectory_cache[2]
+
+    def draw(self, key, surface, rect):
+        self.frame[key] = (surface, pygame.Rect(rect))
+
+    def invalidate(self):
+        self.full_redraw = True
+
+    def present(self):
+        if self.full_redraw:
+            self.screen.blit(self.background, (0, 0))
+            for surface, rect in self.frame.values():
+                self.screen.blit(surface, rect)
+            pygame.display.flip()
+            self.full_redraw = False
+        else:
+            dirty = []
+            for key in self.drawn.keys() | self.frame.keys():
+                old = self.drawn.get(key)
+                new = self.frame.get(key)
+                if old and new and old[0] is new[0] and old[1] == new[1]:
+                    continue
+                dirty.extend(item[1] for item in (old, new) if item)
+            dirty = merge_rects(rect.clip(self.screen.get_rect()) for rect in dirty)
+            for rect in dirty:
+                self.screen.blit(self.background, rect, rect)
+            # Everything overlapping a dirty region is redrawn in order, clipped to
+            # that region; the regions are disjoint so alpha is blended only once.
+            for surface, rect in self.frame.values():
+                for index in rect.collidelistall(dirty):
+                    area = rect.clip(dirty[index])
+                    self.screen.blit(surface, area, area.move(-rect.x, -rect.y))
+            if dirty:
+                pygame.display.update(dirty)
+        self.drawn, self.frame = self.frame, {}
@@ -0,0 +1,113 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from Shot_physics import COLLISION_TYPES, simulate_shot
+
+RECORDING_FORMAT = 'basketball-recording'
+RECORDING_VERSION = 1
+SHOWN_DIVERGENCES = 20
+
+
+class Recorder:
+    # One JSON object per line: a header with the seed, then one line per finished shot.
+    def __init__(self, path, seed, player, turbo=False):
+        self.file = open(path, 'w')
+        self.turbo = turbo
+        self.shots = 0
+        self.write({'format': RECORDING_FORMAT, 'version': RECORDING_VERSION, 'seed': seed, 'player': player,
+                    'created': time.time()})
+
+    def write(self, data):
+        self.file.write(json.dumps(data) + '\n')
+        # Interactive sessions can crash or be killed; turbo runs flush on close.
+        if not self.turbo:
+            self.file.flush()
+
+    def record(self, rim_x, speed, angle, made, collision_type):
+        self.write({'shot': self.shots, 'rim_x': rim_x, 'speed': float(speed), 'angle': float(angle),
+                    'made': bool(made), 'collision': collision_type})
+        self.shots += 1
+
+    def close(self):
+        self.file.close()
+
+
+def read_recording(path):
+    with open(path) as f:
+        header = json.loads(f.readline())
+        if header.get('format') != RECORDING_FORMAT or header.get('version') != RECORDING_VERSION:
+            raise ValueError(f"{path} is not a version {RECORDING_VERSION} recording")
+        shots = [json.loads(line) for line in f if line.strip()]
+    columns = {
+        'rim_x': np.array([shot['rim_x'] for shot in shots], dtype=np.float64),
+        'speed': np.array([shot['speed'] for shot in shots], dtype=np.float64),
+        'angle': np.array([shot['angle'] for shot in shots], dtype=np.float64),
+        'made': np.array([shot['made'] for shot in shots], dtype=bool),
+        'collision': np.array([COLLISION_TYPES.index(shot['collision']) for shot in shots], dtype=np.int8),
+    }
+    return header, columns
+
+
+def find_divergences(columns):
+    # Shot by shot through the game's own plain-float step rather than ShotBatch, whose
+    # NumPy arithmetic may round differently and flip a shot that grazes the rim.
+    made = np.zeros(len(columns['speed']), dtype=bool)
+    collision = np.zeros(len(columns['speed']), dtype=np.int8)
+    for i, shot in enumerate(zip(columns['speed'], columns['angle'], columns['rim_x'])):
+        made[i], collision[i] = simulate_shot(*(float(value) for value in shot))
+    diverged = np.flatnonzero((made != columns['made']) | (collision != columns['collision']))
+    return diverged, made, collision
+
+
+def play_back(paths, rate):
+    # pygame is only needed when a recording is rendered.
+    from Training_game import PlaybackGame
+    game = PlaybackGame()
+    for path in paths:
+        _, columns = read_recording(path)
+        game.reset_game()
+        for i in range(len(columns['speed'])):
+            game.chances_played, game.baskets_scored = i % 15, int(columns['made'][i - i % 15:i].sum())
+            if not game.play_shot(columns['speed'][i], columns['angle'][i], int(columns['rim_x'][i]), rate):
+                return
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-simulate recorded games and report shots whose outcome changed.")
+    parser.add_argument('recordings', nargs='+', help="recording files written with --record")
+    parser.add_argument('--render', action='store_true', help="play the recordings back in the game window")
+    parser.add_argument('--rate', type=float, default=1.0, help="playback speed when rendering (2 = twice as fast)")
+    args = parser.parse_args()
+
+    if args.render:
+        play_back(args.recordings, args.rate)
+        return
+
+    loaded = [(path,) + read_recording(path) for path in args.recordings]
+    columns = {name: np.concatenate([c[name] for _, _, c in loaded]) for name in loaded[0][2]}
+    sources = [(path, i) for path, _, c in loaded for i in range(len(c['speed']))]
+
+    start = time.perf_counter()
+    diverged, made, collision = find_divergences(columns)
+    elapsed = time.perf_counter() - start
+    print(f"Replayed {len(sources)} shots from {len(loaded)} recording(s) in {elapsed:.2f}s: "
+          f"{int(columns['made'].sum())} made when recorded, {int(made.sum())} made now")
+
+    for i in diverged[:SHOWN_DIVERGENCES]:
+        path, shot = sources[i]
+        print(f"  {os.path.basename(path)} shot {shot}: rim {columns['rim_x'][i]:g}, speed {columns['speed'][i]:.3f}, "
+              f"angle {columns['angle'][i]:.3f}: made {bool(columns['made'][i])} -> {bool(made[i])}, "
+              f"collision {COLLISION_TYPES[columns['collision'][i]]} -> {COLLISION_TYPES[collision[i]]}")
+    if len(diverged):
+        print(f"{len(diverged)} shot(s) diverged")
+        sys.exit(1)
+    print("No divergences")
+
+
+if __name__ == "__main__":
+    main()
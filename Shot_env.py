@@ -0,0 +1,122 @@
+import argparse
+import time
+
+import numpy as np
+
+from Shot_physics import MAX_POWER, RIM_MIN_X, RIM_MAX_X, SHOTS_PER_GAME, simulate_shots
+
+
+class VectorShotEnv:
+    # N independent games stepped together: observation is rim_x, action is (speed, angle in degrees),
+    # reward is 1 for a made basket. Finished games start over on the next step.
+    def __init__(self, num_envs, seed=None, shots_per_episode=SHOTS_PER_GAME, index=None):
+        self.num_envs = num_envs
+        self.shots_per_episode = shots_per_episode
+        # An optional Make_index.MakeIndex answers from its bitmap instead of stepping the physics.
+        self.index = index
+        self.rng = np.random.default_rng(seed)
+        self.rim_x = np.zeros(num_envs, dtype=np.int64)
+        self.shots = np.zeros(num_envs, dtype=np.int64)
+        self.score = np.zeros(num_envs, dtype=np.int64)
+
+    def observation(self):
+        return self.rim_x[:, None].astype(np.float32)
+
+    def reset(self, seed=None):
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+        self.rim_x = self.rng.integers(RIM_MIN_X, RIM_MAX_X + 1, size=self.num_envs)
+        self.shots[:] = 0
+        self.score[:] = 0
+        return self.observation(), {}
+
+    def step(self, actions):
+        actions = np.asarray(actions, dtype=float).reshape(self.num_envs, 2)
+        speed = np.clip(actions[:, 0], 0, MAX_POWER)
+        angle = actions[:, 1]
+        if self.index is None:
+            made, collision = simulate_shots(speed, angle, self.rim_x, until_decided=True)
+            info = {'collision': collision}
+        else:
+            made, info = self.index.made(self.rim_x, speed, angle), {}
+        self.shots += 1
+        self.score += made
+        terminated = self.shots >= self.shots_per_episode
+        info['made'] = made
+        info['episode_score'] = np.where(terminated, self.score, 0)
+        self.shots[terminated] = 0
+        self.score[terminated] = 0
+        self.rim_x = self.rng.integers(RIM_MIN_X, RIM_MAX_X + 1, size=self.num_envs)
+        return self.observation(), made.astype(np.float32), terminated, np.zeros(self.num_envs, dtype=bool), info
+
+
+class ShotEnv:
+    def __init__(self, seed=None, shots_per_episode=SHOTS_PER_GAME, render_mode=None, index=None):
+        self.env = VectorShotEnv(1, seed, shots_per_episode, index)
+        self.render_mode = render_mode
+        self.last_shot = None
+        self.game = None
+
+    def reset(self, seed=None):
+        obs, info = self.env.reset(seed)
+        self.last_shot = None
+        return obs[0], info
+
+    def step(self, action):
+        speed, angle = np.asarray(action, dtype=float)
+        env = self.env
+        self.last_shot = (float(np.clip(speed, 0, MAX_POWER)), float(angle), int(env.rim_x[0]),
+                          int(env.shots[0]), int(env.score[0]))
+        obs, reward, terminated, truncated, info = env.step([[speed, angle]])
+        if self.render_mode == 'human':
+            self.render()
+        return obs[0], float(reward[0]), bool(terminated[0]), bool(truncated[0]), {k: v[0] for k, v in info.items()}
+
+    def render(self):
+        if self.last_shot is None:
+            return
+        if self.game is None:
+            # pygame is only loaded once something asks to be drawn.
+            from Training_game import PlaybackGame
+            self.game = PlaybackGame()
+        speed, angle, rim_x, shots, score = self.last_shot
+        self.game.chances_played, self.game.baskets_scored = shots, score
+        if not self.game.play_shot(speed, angle, rim_x):
+            self.close()
+            self.render_mode = None
+
+    def close(self):
+        if self.game is not None:
+            import pygame
+            pygame.quit()
+            self.game = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure environment throughput with random actions.")
+    parser.add_argument('--envs', type=int, default=16384)
+    parser.add_argument('--steps', type=int, default=30)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--index', help="look outcomes up in a make index instead of simulating")
+    args = parser.parse_args()
+
+    index = None
+    if args.index:
+        from Make_index import MakeIndex
+        index = MakeIndex(args.index)
+    env = VectorShotEnv(args.envs, args.seed, index=index)
+    env.reset()
+    rng = np.random.default_rng(args.seed)
+    made = 0
+    start = time.perf_counter()
+    for _ in range(args.steps):
+        actions = np.column_stack([rng.uniform(0, MAX_POWER, args.envs), rng.uniform(0, 90, args.envs)])
+        _, reward, _, _, _ = env.step(actions)
+        made += int(reward.sum())
+    elapsed = time.perf_counter() - start
+    shots = args.envs * args.steps
+    print(f"{shots} shots in {elapsed:.2f}s ({shots / elapsed:,.0f} shots/s), {made} made")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+import argparse
+import atexit
+import contextlib
+import json
+import os
+import queue
+import secrets
+import threading
+import time
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:
+    # Windows has no flock; a log there must only have one writer at a time.
+    fcntl = None
+
+from Shot_physics import COLLISION_TYPES
+
+LOG_FORMAT = 'basketball-shot-log'
+LOG_VERSION = 1
+# One little-endian file per column; row i of every file is one shot.
+COLUMNS = {
+    'speed': '<f4',
+    'angle': '<f4',
+    'rim_x': '<i2',
+    'made': '|u1',
+    'collision': '|i1',
+    'session': '<u8',
+    'timestamp': '<f8',
+}
+
+
+def column_path(path, name):
+    return os.path.join(path, f'{name}.bin')
+
+
+@contextlib.contextmanager
+def write_lock(path):
+    # Every writer appends a whole batch to all columns under this lock, so rows from
+    # two processes can never interleave differently in different column files.
+    with open(os.path.join(path, 'write.lock'), 'a') as f:
+        if fcntl:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        yield
+
+
+def row_count(path):
+    counts = []
+    for name, dtype in COLUMNS.items():
+        file_path = column_path(path, name)
+        size = os.path.getsize(file_path) if os.path.isfile(file_path) else 0
+        counts.append(size // np.dtype(dtype).itemsize)
+    return min(counts)
+
+
+def init_log(path):
+    os.makedirs(path, exist_ok=True)
+    schema_path = os.path.join(path, 'schema.json')
+    with write_lock(path):
+        if os.path.isfile(schema_path):
+            with open(schema_path) as f:
+                schema = json.load(f)
+            if schema.get('format') != LOG_FORMAT or schema.get('version') != LOG_VERSION:
+                raise ValueError(f"{path} is not a version {LOG_VERSION} shot log")
+        else:
+            with open(schema_path, 'w') as f:
+                json.dump({'format': LOG_FORMAT, 'version': LOG_VERSION, 'columns': COLUMNS,
+                           'collision_types': COLLISION_TYPES}, f, indent=2)
+        # A crash can leave a partly written row; cut every column back to the last whole row.
+        rows = row_count(path)
+        for name, dtype in COLUMNS.items():
+            with open(column_path(path, name), 'ab') as f:
+                f.truncate(rows * np.dtype(dtype).itemsize)
+    return rows
+
+
+def append_columns(path, columns, files=None):
+    n = len(columns['speed'])
+    data = {name: np.ascontiguousarray(np.broadcast_to(np.asarray(columns[name], dtype=dtype), (n,)))
+            for name, dtype in COLUMNS.items()}
+    with write_lock(path):
+        for name in COLUMNS:
+            if files is None:
+                with open(column_path(path, name), 'ab') as f:
+                    f.write(data[name].tobytes())
+            else:
+                # Buffered writes must reach the files before the lock is released.
+                files[name].write(data[name].tobytes())
+                files[name].flush()
+    return n
+
+
+def merge_logs(path, shard_paths):
+    init_log(path)
+    total = 0
+    for shard_path in shard_paths:
+        total += append_columns(path, read_shots(shard_path))
+    return total
+
+
+class ShotLog:
+    def __init__(self, path, session=None):
+        self.path = path
+        init_log(path)
+        self.session = secrets.randbits(64) if session is None else session
+        self.files = {name: open(column_path(path, name), 'ab') for name in COLUMNS}
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self._write_loop, name='shot-log', daemon=True)
+        self.thread.start()
+        atexit.register(self.close)
+
+    def record(self, speed, angle, rim_x, made, collision_type):
+        self.queue.put((speed, angle, rim_x, made, COLLISION_TYPES.index(collision_type), time.time()))
+
+    def _write_loop(self):
+        running = True
+        while running:
+            rows = [self.queue.get()]
+            while True:
+                try:
+                    rows.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            if None in rows:
+                running = False
+                rows = [row for row in rows if row is not None]
+            if rows:
+                speed, angle, rim_x, made, collision, timestamp = zip(*rows)
+                append_columns(self.path, {'speed': speed, 'angle': angle, 'rim_x': rim_x, 'made': made,
+                                           'collision': collision, 'session': self.session,
+                                           'timestamp': timestamp}, self.files)
+                for f in self.files.values():
+                    os.fsync(f.fileno())
+
+    def close(self):
+        if self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join()
+        for f in self.files.values():
+            f.close()
+        atexit.unregister(self.close)
+
+
+def open_columns(path):
+    rows = row_count(path)
+    return {name: np.memmap(column_path(path, name), dtype=dtype, mode='r', shape=(rows,)) if rows else
+            np.zeros(0, dtype=dtype) for name, dtype in COLUMNS.items()}
+
+
+def read_shots(path, made=None, session=None, rim_range=None, columns=None):
+    data = open_columns(path)
+    mask = np.ones(len(data['speed']), dtype=bool)
+    if made is not None:
+        mask &= data['made'] == made
+    if session is not None:
+        mask &= data['session'] == np.uint64(session)
+    if rim_range is not None:
+        mask &= (data['rim_x'] >= rim_range[0]) & (data['rim_x'] <= rim_range[1])
+    return {name: np.asarray(data[name][mask]) for name in (columns or COLUMNS)}
+
+
+def main():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="Summarise a shot log.")
+    parser.add_argument('path', nargs='?', default=os.path.join(script_dir, 'shots'))
+    args = parser.parse_args()
+
+    shots = read_shots(args.path)
+    total = len(shots['speed'])
+    made = int(shots['made'].sum())
+    print(f"{total} shots in {len(np.unique(shots['session']))} sessions, {made} made")
+    for code, name in enumerate(COLLISION_TYPES):
+        count = int((shots['collision'] == code).sum())
+        if count:
+            print(f"  {name or 'no rim contact'}: {count}")
+
+
+if __name__ == "__main__":
+    main()
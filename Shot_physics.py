@@ -0,0 +1,361 @@
+import math
+
+import numpy as np
+
+WIDTH, HEIGHT = 800, 600
+BALL_RADIUS = 20
+RIM_RADIUS = 35
+RIM_THICKNESS = 5
+RIM_HEIGHT = 32
+GRAVITY = 17
+POWER_SCALING = 0.8
+MAX_POWER = 105
+RIM_Y = HEIGHT - 300
+RIM_OFFSET = 35
+RIM_VERTICAL_OFFSET = 20
+
+START_X, START_Y = 100, HEIGHT - 100
+RIM_MIN_X, RIM_MAX_X = 200, WIDTH - 200
+TIME_STEP = 1 / 10
+# Fraction of the ball's speed kept after bouncing off the rim (the original game's 0.15 * 60 per 0.1 s step).
+RIM_RESTITUTION = 0.9
+# The game ignored the rim for 50 ms after a bounce; at 60 FPS and one 0.1 s step per frame
+# the first sample it checked again was 0.4 s of simulated time later.
+BOUNCE_COOLDOWN = 0.4
+TOP_DEFLECTION = 0.2
+SIDE_DEFLECTION = 0.1
+TOP_COS, TOP_SIN = math.cos(TOP_DEFLECTION), math.sin(TOP_DEFLECTION)
+SIDE_COS, SIDE_SIN = math.cos(SIDE_DEFLECTION), math.sin(SIDE_DEFLECTION)
+MAX_STEPS = 2000
+SHOTS_PER_GAME = 15
+BATCH_SIZE = 16384
+
+RIM_TOP_Y = RIM_Y + RIM_VERTICAL_OFFSET
+RIM_BOTTOM_Y = RIM_TOP_Y + RIM_HEIGHT * 2
+RIM_LEFT_OFFSET = -RIM_RADIUS + 10
+RIM_RIGHT_OFFSET = RIM_RADIUS + 4
+SCORE_Y = RIM_TOP_Y + RIM_HEIGHT - BALL_RADIUS
+
+COLLISION_TYPES = (None, "top_left", "top_right", "front_left", "back_left", "front_right", "back_right")
+NO_COLLISION, TOP_LEFT, TOP_RIGHT, FRONT_LEFT, BACK_LEFT, FRONT_RIGHT, BACK_RIGHT = range(len(COLLISION_TYPES))
+
+
+def axis_span(start, delta, low, high):
+    # Range of t where start + t * delta lies in [low, high]; empty when the first bound is larger.
+    if delta == 0:
+        return (-math.inf, math.inf) if low <= start <= high else (math.inf, -math.inf)
+    a, b = (low - start) / delta, (high - start) / delta
+    return (a, b) if a <= b else (b, a)
+
+
+def region_entry(prev_x, prev_y, dx, dy, x0, x1, y0, y1, after):
+    # Earliest t in [after, 1] at which prev + t * d is inside the box, or inf.
+    x_in, x_out = axis_span(prev_x, dx, x0, x1)
+    y_in, y_out = axis_span(prev_y, dy, y0, y1)
+    t = max(x_in, y_in, after)
+    return t if t <= min(x_out, y_out, 1.0) else math.inf
+
+
+def rim_contact(prev_x, prev_y, dx, dy, vy, since_bounce, rim_x, time_step):
+    # The game's rim rules as regions of the ball centre: a band across the top of the opening
+    # that deflects a falling ball, and a box around each rim edge that turns back a ball moving
+    # sideways. A contact is the first moment of the step at which the centre is inside a region
+    # and the rule applies; vy is the vertical speed (y up) at prev.
+    left_x, right_x = rim_x + RIM_LEFT_OFFSET, rim_x + RIM_RIGHT_OFFSET
+    after = max(0.0, (BOUNCE_COOLDOWN - since_bounce) / time_step)
+    # A falling ball: vy - GRAVITY * t * time_step < 0.
+    t = region_entry(prev_x, prev_y, dx, dy, left_x, right_x, RIM_TOP_Y - BALL_RADIUS, RIM_TOP_Y + BALL_RADIUS,
+                     max(after, vy / (GRAVITY * time_step)))
+    if t != math.inf:
+        return t, TOP_LEFT if prev_x + dx * t < rim_x else TOP_RIGHT
+    if dx == 0:
+        return math.inf, NO_COLLISION
+    t = region_entry(prev_x, prev_y, dx, dy, left_x - BALL_RADIUS, left_x + BALL_RADIUS, RIM_TOP_Y, RIM_BOTTOM_Y, after)
+    right_t = region_entry(prev_x, prev_y, dx, dy, right_x - BALL_RADIUS, right_x + BALL_RADIUS, RIM_TOP_Y,
+                           RIM_BOTTOM_Y, after)
+    if right_t < t:
+        return right_t, BACK_RIGHT if dx > 0 else FRONT_RIGHT
+    if t != math.inf:
+        return t, FRONT_LEFT if dx > 0 else BACK_LEFT
+    return math.inf, NO_COLLISION
+
+
+def deflect(vx, vy, code):
+    # The game's bounce rules: off the top the ball keeps going, turned 0.2 rad away from the
+    # rim centre; off an edge it is mirrored sideways and turned 0.1 rad further. Either way it
+    # keeps RIM_RESTITUTION of its speed. Written as rotations so every path rounds alike.
+    if code == TOP_LEFT or code == TOP_RIGHT:
+        sin = TOP_SIN if code == TOP_RIGHT else -TOP_SIN
+        return (vx * TOP_COS - vy * sin) * RIM_RESTITUTION, (vx * sin + vy * TOP_COS) * RIM_RESTITUTION
+    return (-vx * SIDE_COS - vy * SIDE_SIN) * RIM_RESTITUTION, (-vx * SIDE_SIN + vy * SIDE_COS) * RIM_RESTITUTION
+
+
+def rim_bounce(prev_x, prev_y, ball_x, ball_y, rim_x, velocity, since_bounce=math.inf, time_step=TIME_STEP):
+    # Plain-float version of the contact test for the per-frame game loop.
+    # velocity is the ball's (vx, vy), y up, at prev; since_bounce is the time since the last bounce.
+    if not (min(prev_x, ball_x) <= rim_x + RIM_RIGHT_OFFSET + BALL_RADIUS and
+            max(prev_x, ball_x) >= rim_x + RIM_LEFT_OFFSET - BALL_RADIUS and
+            min(prev_y, ball_y) <= RIM_BOTTOM_Y and
+            max(prev_y, ball_y) >= RIM_TOP_Y - BALL_RADIUS):
+        return None
+    dx, dy = ball_x - prev_x, ball_y - prev_y
+    t, code = rim_contact(prev_x, prev_y, dx, dy, velocity[1], since_bounce, rim_x, time_step)
+    if code == NO_COLLISION:
+        return None
+    vx, vy = deflect(velocity[0], velocity[1] - GRAVITY * (t * time_step), code)
+    return prev_x + dx * t, prev_y + dy * t, vx, vy, COLLISION_TYPES[code]
+
+
+def basket_entered(prev_x, prev_y, ball_x, ball_y, rim_x):
+    # The ball scores when its centre, moving down, passes through the net below SCORE_Y.
+    dx, dy = ball_x - prev_x, ball_y - prev_y
+    if dy <= 0:
+        return False
+    x_in, x_out = axis_span(prev_x, dx, rim_x - RIM_RADIUS + BALL_RADIUS, rim_x + RIM_RADIUS - BALL_RADIUS)
+    y_in, y_out = axis_span(prev_y, dy, SCORE_Y, RIM_BOTTOM_Y)
+    return max(x_in, y_in, 0.0) < min(x_out, y_out, 1.0)
+
+
+def axis_spans(start, delta, low, high):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        a, b = (low - start) / delta, (high - start) / delta
+    moving = delta != 0
+    inside = (low <= start) & (start <= high)
+    enter = np.where(moving, np.minimum(a, b), np.where(inside, -np.inf, np.inf))
+    leave = np.where(moving, np.maximum(a, b), np.where(inside, np.inf, -np.inf))
+    return enter, leave
+
+
+def region_entries(prev_x, prev_y, dx, dy, x0, x1, y0, y1, after):
+    x_in, x_out = axis_spans(prev_x, dx, x0, x1)
+    y_in, y_out = axis_spans(prev_y, dy, y0, y1)
+    t = np.maximum(np.maximum(x_in, y_in), after)
+    return np.where(t <= np.minimum(np.minimum(x_out, y_out), 1.0), t, np.inf)
+
+
+def near_rim(prev_x, prev_y, ball_x, ball_y, rim_x):
+    # Cheap bounding-box test; only segments that pass it can reach a rim region.
+    return ((np.minimum(prev_x, ball_x) <= rim_x + RIM_RIGHT_OFFSET + BALL_RADIUS) &
+            (np.maximum(prev_x, ball_x) >= rim_x + RIM_LEFT_OFFSET - BALL_RADIUS) &
+            (np.minimum(prev_y, ball_y) <= RIM_BOTTOM_Y) &
+            (np.maximum(prev_y, ball_y) >= RIM_TOP_Y - BALL_RADIUS))
+
+
+def sweep_rim(prev_x, prev_y, dx, dy, vy, since_bounce, rim_x, time_step=TIME_STEP):
+    # rim_contact for arrays of steps; returns contact times (inf for none) and collision codes.
+    left_x, right_x = rim_x + RIM_LEFT_OFFSET, rim_x + RIM_RIGHT_OFFSET
+    after = np.maximum(0.0, (BOUNCE_COOLDOWN - since_bounce) / time_step)
+    top_t = region_entries(prev_x, prev_y, dx, dy, left_x, right_x, RIM_TOP_Y - BALL_RADIUS,
+                           RIM_TOP_Y + BALL_RADIUS, np.maximum(after, vy / (GRAVITY * time_step)))
+    left_t = region_entries(prev_x, prev_y, dx, dy, left_x - BALL_RADIUS, left_x + BALL_RADIUS, RIM_TOP_Y,
+                            RIM_BOTTOM_Y, after)
+    right_t = region_entries(prev_x, prev_y, dx, dy, right_x - BALL_RADIUS, right_x + BALL_RADIUS, RIM_TOP_Y,
+                             RIM_BOTTOM_Y, after)
+    sideways = dx != 0
+    left_t = np.where(sideways, left_t, np.inf)
+    right_t = np.where(sideways, right_t, np.inf)
+    top = top_t != np.inf
+    right = ~top & (right_t < left_t)
+    t = np.where(top, top_t, np.where(right, right_t, left_t))
+    codes = np.where(top, np.where(prev_x + dx * top_t < rim_x, TOP_LEFT, TOP_RIGHT),
+                     np.where(right, np.where(dx > 0, BACK_RIGHT, FRONT_RIGHT),
+                              np.where(dx > 0, FRONT_LEFT, BACK_LEFT)))
+    return t, np.where(t != np.inf, codes, NO_COLLISION).astype(np.int8)
+
+
+def deflections(vx, vy, codes):
+    top = (codes == TOP_LEFT) | (codes == TOP_RIGHT)
+    sin = np.where(codes == TOP_RIGHT, TOP_SIN, -TOP_SIN)
+    new_vx = np.where(top, vx * TOP_COS - vy * sin, -vx * SIDE_COS - vy * SIDE_SIN) * RIM_RESTITUTION
+    new_vy = np.where(top, vx * sin + vy * TOP_COS, -vx * SIDE_SIN + vy * SIDE_COS) * RIM_RESTITUTION
+    return new_vx, new_vy
+
+
+def baskets_entered(prev_x, prev_y, ball_x, ball_y, rim_x):
+    dx, dy = ball_x - prev_x, ball_y - prev_y
+    x_in, x_out = axis_spans(prev_x, dx, rim_x - RIM_RADIUS + BALL_RADIUS, rim_x + RIM_RADIUS - BALL_RADIUS)
+    y_in, y_out = axis_spans(prev_y, dy, SCORE_Y, RIM_BOTTOM_Y)
+    return (dy > 0) & (np.maximum(np.maximum(x_in, y_in), 0.0) < np.minimum(np.minimum(x_out, y_out), 1.0))
+
+
+class Trajectory:
+    def __init__(self, speed, angle, start_x, start_y, max_steps=MAX_STEPS, time_step=TIME_STEP):
+        self.start_x, self.start_y = start_x, start_y
+        self.vx = speed * math.cos(angle)
+        self.vy = speed * math.sin(angle)
+        self.time_step = time_step
+        self.time = 0
+        self.sample_time = 0
+        self.steps_left = max_steps
+        self.pending = None
+
+    @classmethod
+    def from_velocity(cls, vx, vy, start_x, start_y, max_steps=MAX_STEPS, time_step=TIME_STEP):
+        # Bounces hand the velocity over as is; going through speed and angle would round it.
+        trajectory = cls(0.0, 0.0, start_x, start_y, max_steps, time_step)
+        trajectory.vx, trajectory.vy = vx, vy
+        return trajectory
+
+    def point_at(self, time):
+        x = self.start_x + self.vx * time
+        y = self.start_y - (self.vy * time - 0.5 * GRAVITY * time ** 2)
+        if y >= HEIGHT or x < 0 or x > WIDTH:
+            return None
+        return x, y
+
+    def _fill(self):
+        if self.pending is None and self.steps_left > 0:
+            self.time += self.time_step
+            self.pending = self.point_at(self.time)
+            self.steps_left = self.steps_left - 1 if self.pending else 0
+        return self.pending
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        point = self._fill()
+        if point is None:
+            raise StopIteration
+        self.pending = None
+        self.sample_time = self.time
+        return point
+
+    def velocity(self):
+        # (vx, vy), y up, at the last point returned.
+        return self.vx, self.vy - GRAVITY * self.sample_time
+
+    def __bool__(self):
+        return self._fill() is not None
+
+    def preview(self):
+        points = [self.pending] if self.pending else []
+        time = self.time
+        for _ in range(self.steps_left):
+            time += self.time_step
+            point = self.point_at(time)
+            if point is None:
+                break
+            points.append(point)
+        return points
+
+
+class ShotBatch:
+    def __init__(self, speed, angle, rim_x, start_x=START_X, start_y=START_Y, until_decided=False,
+                 time_step=TIME_STEP):
+        speed, angle, rim_x = np.broadcast_arrays(np.asarray(speed, dtype=float),
+                                                  np.asarray(angle, dtype=float),
+                                                  np.asarray(rim_x, dtype=float))
+        self.shape = speed.shape
+        theta = np.radians(angle.ravel())
+        speed = speed.ravel()
+        n = speed.size
+
+        self.rim_x = rim_x.ravel().copy()
+        self.origin_x = np.full(n, float(start_x))
+        self.origin_y = np.full(n, float(start_y))
+        self.vx = speed * np.cos(theta)
+        self.vy = speed * np.sin(theta)
+        self.time = np.zeros(n)
+        self.x = self.origin_x.copy()
+        self.y = self.origin_y.copy()
+        self.active = np.ones(n, dtype=bool)
+        self.made = np.zeros(n, dtype=bool)
+        self.collision = np.zeros(n, dtype=np.int8)
+        self.steps = 0
+        # Retire shots once the outcome is known; later rim contacts are then not recorded.
+        self.until_decided = until_decided
+        self.time_step = time_step
+
+    def step(self):
+        idx = np.flatnonzero(self.active)
+        if not idx.size:
+            return False
+        self.steps += 1
+
+        time = self.time[idx] + self.time_step
+        x = self.origin_x[idx] + self.vx[idx] * time
+        y = self.origin_y[idx] - (self.vy[idx] * time - 0.5 * GRAVITY * time ** 2)
+        inside = (y < HEIGHT) & (x >= 0) & (x <= WIDTH)
+        self.active[idx[~inside]] = False
+
+        idx, time, x, y = idx[inside], time[inside], x[inside], y[inside]
+        prev_x, prev_y = self.x[idx], self.y[idx]
+        rim_x = self.rim_x[idx]
+
+        near = np.flatnonzero(near_rim(prev_x, prev_y, x, y, rim_x))
+        if near.size:
+            near_idx = idx[near]
+            prev_time = self.time[near_idx]
+            vy = self.vy[near_idx] - GRAVITY * prev_time
+            # Time since the last bounce; the origin moves to every bounce point.
+            since_bounce = np.where(self.collision[near_idx] != NO_COLLISION, prev_time, np.inf)
+            dx, dy = x[near] - prev_x[near], y[near] - prev_y[near]
+            t, codes = sweep_rim(prev_x[near], prev_y[near], dx, dy, vy, since_bounce, rim_x[near], self.time_step)
+            hit = codes != NO_COLLISION
+            hit_local, hit_idx, t = near[hit], near_idx[hit], t[hit]
+            x[hit_local] = prev_x[hit_local] + dx[hit] * t
+            y[hit_local] = prev_y[hit_local] + dy[hit] * t
+            self.vx[hit_idx], self.vy[hit_idx] = deflections(self.vx[hit_idx], vy[hit] - GRAVITY * (t * self.time_step),
+                                                             codes[hit])
+            self.origin_x[hit_idx], self.origin_y[hit_idx] = x[hit_local], y[hit_local]
+            time[hit_local] = 0
+            first = self.collision[hit_idx] == NO_COLLISION
+            self.collision[hit_idx[first]] = codes[hit][first]
+
+        scored = ~self.made[idx] & baskets_entered(prev_x, prev_y, x, y, rim_x)
+        self.made[idx[scored]] = True
+        self.x[idx], self.y[idx], self.time[idx] = x, y, time
+        if self.until_decided:
+            # Below the rim and falling, a ball can never come back up to it.
+            falling = self.vy[idx] - GRAVITY * time < 0
+            self.active[idx[self.made[idx] | (falling & (y > RIM_BOTTOM_Y + BALL_RADIUS))]] = False
+        return True
+
+    def run(self, max_steps=MAX_STEPS):
+        while self.steps < max_steps and self.step():
+            pass
+        self.active[:] = False
+        return self.made.reshape(self.shape), self.collision.reshape(self.shape)
+
+
+def simulate_shot(speed, angle, rim_x, start_x=START_X, start_y=START_Y, max_steps=MAX_STEPS, time_step=TIME_STEP):
+    # One shot in plain floats, stepped exactly as the game loop steps it (Game.step_ball),
+    # so recorded games replay bit for bit. angle is in degrees.
+    trajectory = Trajectory(speed, math.radians(angle), start_x, start_y, max_steps, time_step)
+    x, y = start_x, start_y
+    made, collision = False, NO_COLLISION
+    scored_from = None
+    while trajectory and y < HEIGHT:
+        prev_x, prev_y = x, y
+        velocity = trajectory.velocity()
+        since_bounce = trajectory.sample_time if collision != NO_COLLISION else math.inf
+        x, y = next(trajectory)
+        bounce = rim_bounce(prev_x, prev_y, x, y, rim_x, velocity, since_bounce, time_step)
+        if bounce:
+            x, y, vx, vy, collision_type = bounce
+            collision = collision or COLLISION_TYPES.index(collision_type)
+            trajectory = Trajectory.from_velocity(vx, vy, x, y, max_steps, time_step)
+        # The game only checks for a basket from the first step's end point on.
+        if not made:
+            made = scored_from is not None and basket_entered(*scored_from, x, y, rim_x)
+            scored_from = (x, y)
+    return made, collision
+
+
+def simulate_shots(speed, angle, rim_x, max_steps=MAX_STEPS, batch_size=BATCH_SIZE, until_decided=False,
+                   time_step=TIME_STEP):
+    speed, angle, rim_x = np.broadcast_arrays(np.asarray(speed, dtype=float),
+                                              np.asarray(angle, dtype=float),
+                                              np.asarray(rim_x, dtype=float))
+    shape = speed.shape
+    made = np.zeros(speed.size, dtype=bool)
+    collision = np.zeros(speed.size, dtype=np.int8)
+    speed, angle, rim_x = speed.ravel(), angle.ravel(), rim_x.ravel()
+    # Small batches keep the per-step working set in cache.
+    for start in range(0, speed.size, batch_size):
+        chunk = slice(start, start + batch_size)
+        made[chunk], collision[chunk] = ShotBatch(speed[chunk], angle[chunk], rim_x[chunk],
+                                                      until_decided=until_decided,
+                                                      time_step=time_step).run(max_steps)
+    return made.reshape(shape), collision.reshape(shape)
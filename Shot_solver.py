@@ -0,0 +1,112 @@
+import argparse
+import os
+import secrets
+import time
+
+import numpy as np
+
+from Shot_physics import (START_X, START_Y, GRAVITY, MAX_POWER, BALL_RADIUS, RIM_RADIUS, RIM_TOP_Y, RIM_LEFT_OFFSET,
+                          SCORE_Y, RIM_MIN_X, RIM_MAX_X, simulate_shots)
+from Shot_log import init_log, append_columns
+
+SCORE_HEIGHT = START_Y - SCORE_Y
+EDGE_TOP_HEIGHT = START_Y - RIM_TOP_Y
+# Where the ball centre may cross SCORE_Y: inside the scoring window and clear of the box around the left rim edge.
+WINDOW_LEFT = max(RIM_LEFT_OFFSET + BALL_RADIUS, BALL_RADIUS - RIM_RADIUS)
+WINDOW_RIGHT = RIM_RADIUS - BALL_RADIUS
+ANGLES = np.arange(1.0, 89.0, 0.1)
+
+
+def curvature_speed(k, cos_theta):
+    # y rises as u*tan(theta) - k*u**2 with k = GRAVITY / (2 v^2 cos^2 theta).
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.sqrt(GRAVITY / (2 * k * cos_theta ** 2))
+
+
+def crossing_curvature(u, tan_theta):
+    # Curvature whose descending branch passes SCORE_HEIGHT at horizontal distance u;
+    # NaN where that crossing would still be on the way up.
+    with np.errstate(divide='ignore', invalid='ignore'):
+        k = (u * tan_theta - SCORE_HEIGHT) / u ** 2
+    return np.where(u * tan_theta > 2 * SCORE_HEIGHT, k, np.nan)
+
+
+def clearing_curvature(u, tan_theta):
+    # Largest curvature that keeps the path above the top of the rim edges at horizontal distance u.
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (u * tan_theta - EDGE_TOP_HEIGHT) / u ** 2
+
+
+def speed_range(angle, rim_x):
+    # Speeds whose path passes over the left rim edge's box and drops through the scoring window.
+    # On the way down the ball crosses the band across the top of the opening, which turns it
+    # by 0.2 rad; the window is narrow enough that it still scores, as --verify checks.
+    angle, rim_x = np.broadcast_arrays(np.asarray(angle, dtype=float), np.asarray(rim_x, dtype=float))
+    theta = np.radians(angle)
+    tan_theta, cos_theta = np.tan(theta), np.cos(theta)
+    k_low = crossing_curvature(rim_x + WINDOW_RIGHT - START_X, tan_theta)
+    # The descending crossing must be past the apex, so the near end can be the apex itself.
+    u_near = np.maximum(rim_x + WINDOW_LEFT - START_X, 2 * SCORE_HEIGHT / tan_theta * (1 + 1e-9))
+    k_high = crossing_curvature(u_near, tan_theta)
+    # The path is a downward parabola, so it clears the whole box if it clears both of its sides.
+    for offset in (RIM_LEFT_OFFSET - BALL_RADIUS, RIM_LEFT_OFFSET + BALL_RADIUS):
+        k_high = np.minimum(k_high, clearing_curvature(rim_x + offset - START_X, tan_theta))
+
+    speed_low = curvature_speed(k_high, cos_theta)
+    speed_high = np.minimum(curvature_speed(k_low, cos_theta), MAX_POWER)
+    feasible = speed_low < speed_high
+    return np.where(feasible, speed_low, np.nan), np.where(feasible, speed_high, np.nan)
+
+
+def best_shot(rim_x, angles=ANGLES):
+    rim_x = np.asarray(rim_x, dtype=float)
+    low, high = speed_range(angles, rim_x[..., None])
+    margin = np.nan_to_num((high - low) / 2, nan=-np.inf)
+    best = np.argmax(margin, axis=-1)[..., None]
+    speed = np.take_along_axis((low + high) / 2, best, axis=-1)[..., 0]
+    angle = np.broadcast_to(angles, margin.shape)
+    angle = np.take_along_axis(angle, best, axis=-1)[..., 0]
+    margin = np.take_along_axis(margin, best, axis=-1)[..., 0]
+    solved = np.isfinite(margin)
+    return speed, np.where(solved, angle, np.nan), np.where(solved, margin, np.nan)
+
+
+def main():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="Solve the launch speed and angle that score for each rim position.")
+    parser.add_argument('--rims', type=int, nargs='+', default=[RIM_MIN_X, (RIM_MIN_X + RIM_MAX_X) // 2, RIM_MAX_X])
+    parser.add_argument('--angle', type=float, help="print the feasible speed range at this angle instead")
+    parser.add_argument('--verify', action='store_true',
+                        help="play the solved shot at every rim position with the game's scoring rules")
+    parser.add_argument('--log', nargs='?', const=os.path.join(script_dir, 'shots'),
+                        help="append the solved shot for every rim position to a shot log")
+    args = parser.parse_args()
+
+    if args.angle is not None:
+        low, high = speed_range(args.angle, args.rims)
+        for rim_x, lo, hi in zip(args.rims, low, high):
+            print(f"rim {rim_x}: " + (f"speed {lo:.2f} .. {hi:.2f}" if np.isfinite(lo) else "no scoring speed"))
+    else:
+        speed, angle, margin = best_shot(args.rims)
+        for rim_x, s, a, m in zip(args.rims, speed, angle, margin):
+            print(f"rim {rim_x}: " + (f"speed {s:.2f}, angle {a:.1f} (+/- {m:.2f} speed)" if np.isfinite(s) else
+                                      "no clean shot within MAX_POWER"))
+
+    if args.verify or args.log:
+        rims = np.arange(RIM_MIN_X, RIM_MAX_X + 1)
+        speed, angle, _ = best_shot(rims)
+        # Far rims have no clean shot within MAX_POWER; only the solved ones are played.
+        solved = np.isfinite(speed)
+        speed, angle, rims = speed[solved], angle[solved], rims[solved]
+        made, collision = simulate_shots(speed, angle, rims)
+        print(f"{int(made.sum())} / {len(rims)} solved rim positions scored ({int((~solved).sum())} unsolvable)")
+        if args.log:
+            init_log(args.log)
+            append_columns(args.log, {'speed': speed, 'angle': angle, 'rim_x': rims, 'made': made,
+                                      'collision': collision, 'session': secrets.randbits(64),
+                                      'timestamp': time.time()})
+            print(f"Appended {len(rims)} shots to {args.log}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,13 @@
 import pygame
-import pickle
 import numpy as np
-import random
-import math
 import os
-from Training_game import Game, WIDTH, HEIGHT, MAX_POWER, RIM_Y, WHITE, BLACK, BALL_RADIUS, RIM_RADIUS, RIM_VERTICAL_OFFSET, RIM_HEIGHT
+import hashlib
+import argparse
+from Training_game import Game, SIM_STEP, WIDTH, HEIGHT, MAX_POWER, RIM_Y, WHITE, BLACK, BALL_RADIUS, RIM_RADIUS, RIM_VERTICAL_OFFSET, RIM_HEIGHT
+from Shot_physics import RIM_MIN_X, RIM_MAX_X
+from Poly_model import load_model
+from Profiler import DEFAULT_REPORT
+from Inference_server import InferenceClient, DEFAULT_ADDRESS
 
 
 class Button:
@@ -30,150 +33,174 @@ class Button:
         return False
 
 class AutoGame(Game):
-    def __init__(self):
-        super().__init__()
-        self.load_models()
-        self.shot_delay = 1000
+    log_shots = False
+
+    def __init__(self, turbo=False, games=1, model_file=None, profile=None, seed=None, record=None, server=None,
+                 team=None):
+        self.client = None
+        if server:
+            try:
+                self.client = InferenceClient(server)
+            except OSError as e:
+                print(f"Inference server unavailable ({e}); predicting locally")
+        # Loaded first so recordings can name the player.
+        self.load_models(model_file, team)
+        super().__init__(turbo, profile, seed, record)
+        self.shot_delay = 0 if turbo else 1000
+        self.sim_time = 0
         self.last_shot_time = 0
         self.baskets_scored_left = 0
-        self.player_left_name = None
-
-    def load_models(self):
-        left_model_file = 'model.pkl'
-        with open(left_model_file, 'rb') as f:
-            model_data = pickle.load(f)
-            self.model_l = model_data['model']
-            self.poly_l = model_data['poly']
-        self.player_left_name = os.path.basename(left_model_file).split('.')[0]
+        self.games = games
+        self.games_played = 0
+        self.turbo_baskets = 0
+
+    def load_models(self, left_model_file=None, team=None):
+        if left_model_file is None:
+            left_model_file = 'model.json' if os.path.isfile('model.json') else 'model.pkl'
+        self.model_file_l = left_model_file
+        self.player_left_name = self.player_name = team or os.path.basename(left_model_file).split('.')[0]
+        self.model_l = self.shot_table_l = None
+        if self.client is not None:
+            self.check_server_team()
+        # With a server the local model is only loaded if the server stops answering.
+        if self.client is None:
+            self.load_local_model()
+
+    def check_server_team(self):
+        # The server names teams after their files in teams/, which need not match --model.
+        try:
+            teams = self.client.stats()['teams']
+        except (OSError, ValueError) as e:
+            print(f"Inference server failed ({e}); predicting locally")
+        else:
+            if self.player_left_name in teams:
+                return
+            print(f"Inference server has no team {self.player_left_name!r} (it serves: {', '.join(teams) or 'none'}); "
+                  f"pass --team to pick one; predicting locally")
+        self.client.close()
+        self.client = None
+
+    def load_local_model(self):
+        with open(self.model_file_l, 'rb') as f:
+            model_bytes = f.read()
+        self.model_l = load_model(self.model_file_l)
+        self.shot_table_l = self.load_shot_table(self.player_left_name, model_bytes, self.model_l)
+
+    def load_shot_table(self, name, model_bytes, model):
+        script_dir = os.path.dirname(os.path.abspath(__file__))
+        cache_dir = os.path.join(script_dir, 'cache')
+        model_hash = hashlib.sha256(model_bytes).hexdigest()[:16]
+        cache_path = os.path.join(cache_dir, f'shot_table-{name}-{model_hash}.npy')
+        if os.path.isfile(cache_path):
+            return np.load(cache_path)
+
+        rim_positions = np.arange(RIM_MIN_X, RIM_MAX_X + 1)
+        table = np.ascontiguousarray(model.predict(rim_positions), dtype=np.float64)
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = cache_path + f'.{os.getpid()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.save(f, table)
+        os.replace(tmp_path, cache_path)
+        return table
+
+    def predict_shot(self, rim_x):
+        if self.client:
+            try:
+                return self.client.predict(self.player_left_name, rim_x)
+            except (OSError, ValueError) as e:
+                print(f"Inference server failed ({e}); predicting locally")
+                self.client.close()
+                self.client = None
+        if self.model_l is None:
+            self.load_local_model()
+        index = int(rim_x) - RIM_MIN_X
+        if index == rim_x - RIM_MIN_X and 0 <= index < len(self.shot_table_l):
+            return self.shot_table_l[index]
+        return self.model_l.predict(rim_x)
 
     def auto_shoot(self):
-        rim_x = np.array([[self.rim_x]])
-        X_poly = self.poly_l.transform(rim_x)
-        predictions = self.model_l.predict(X_poly)[0]
-        predicted_speed, predicted_angle = predictions
-        self.arrow_speed = predicted_speed
-        self.arrow_angle = np.radians(predicted_angle)
-        self.trajectory = self.calculate_trajectory(self.arrow_speed, self.arrow_angle, self.arrow_x, self.arrow_y)
-        self.arrow_in_motion = True
-        self.basket_scored_this_chance = False
-        self.prev_positions = []
-        self.last_bounce_time = 0
-
-    def check_rim_collision(self, prev_x, prev_y, ball_x, ball_y):
-        rim_left_x = self.rim_x - RIM_RADIUS + 10
-        rim_right_x = self.rim_x + RIM_RADIUS + 4
-        rim_collision_y = RIM_Y + RIM_VERTICAL_OFFSET
-        moving_right = ball_x > prev_x
-        moving_left = ball_x < prev_x
-        moving_down = ball_y > prev_y
-        if (rim_left_x <= ball_x <= rim_right_x and 
-            abs(ball_y - rim_collision_y) <= BALL_RADIUS and 
-            moving_down):
-            if ball_x < self.rim_x:
-                return True, "top_left"
-            else:
-                return True, "top_right"
-        if rim_collision_y <= ball_y <= rim_collision_y + RIM_HEIGHT * 2:
-            if (abs(ball_x - rim_left_x) <= BALL_RADIUS):
-                if moving_right:
-                    return True, "front_left"
-                elif moving_left:
-                    return True, "back_left"
-            if (abs(ball_x - rim_right_x) <= BALL_RADIUS):
-                if moving_left:
-                    return True, "front_right"
-                elif moving_right:
-                    return True, "back_right"
-        return False, None
+        predicted_speed, predicted_angle = self.predict_shot(self.rim_x)
+        self.launch(float(predicted_speed), float(predicted_angle))
 
     def show_game_over_screen(self):
+        if self.turbo:
+            self.games_played += 1
+            print(f"Game {self.games_played}: {self.player_left_name} {self.baskets_scored_left - self.turbo_baskets} / 15")
+            self.turbo_baskets = self.baskets_scored_left
+            if self.games_played >= self.games:
+                return False
+            self.reset_game()
+            return True
+
         game_over_font = pygame.font.SysFont(None, 72)
         stats_font = pygame.font.SysFont(None, 48)
         button_font = pygame.font.SysFont(None, 36)
 
         play_again_btn = Button(WIDTH // 2 - 100, HEIGHT // 2 + 100, 200, 50, "Play Again", (0, 100, 0))
 
+        redraw = True
         while True:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    return False
-                if play_again_btn.handle_event(event):
-                    self.reset_game()
-                    return True
-
-            self.screen.fill(WHITE)
-
-            game_over_text = game_over_font.render("Game Over!", True, BLACK)
-            self.screen.blit(game_over_text, (WIDTH // 2 - game_over_text.get_width() // 2, HEIGHT // 2 - 150))
-
-            left_player_text = stats_font.render(f"{self.player_left_name}: {self.baskets_scored_left}", True, BLACK)
-            self.screen.blit(left_player_text, (WIDTH // 2 - left_player_text.get_width() // 2, HEIGHT // 2 - 50))
-
-            play_again_btn.draw(self.screen, button_font)
-
-            pygame.display.flip()
-
-    def run(self):
-        running = True
-        while running:
-            self.screen.blit(self.background_image, (0, 0))
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-            current_time = pygame.time.get_ticks()
-            if not self.arrow_in_motion and current_time - self.last_shot_time >= self.shot_delay:
-                self.auto_shoot()
-                self.last_shot_time = current_time
-            ball_rect = self.ball_image.get_rect()
-            ball_rect.centerx = int(self.arrow_x)
-            ball_rect.centery = int(self.arrow_y)
-            self.screen.blit(self.ball_image, ball_rect)
-            hoop_rect = self.hoop_image.get_rect()
-            hoop_rect.centerx = self.rim_x
-            hoop_rect.centery = RIM_Y + 25
-            self.screen.blit(self.hoop_image, hoop_rect)
-            if self.arrow_in_motion and self.trajectory:
-                prev_x, prev_y = self.arrow_x, self.arrow_y
-                self.arrow_x, self.arrow_y = self.trajectory.pop(0)
-                dx = self.arrow_x - prev_x
-                dy = self.arrow_y - prev_y
-                current_speed = math.hypot(dx, dy)
-                current_time = pygame.time.get_ticks()
-                if current_time - self.last_bounce_time > 50:
-                    rim_collision, collision_type = self.check_rim_collision(prev_x, prev_y, self.arrow_x, self.arrow_y)
-                    if rim_collision:
-                        self.last_bounce_time = current_time
-                        bounce_speed = current_speed * 0.15
-                        if collision_type in ["front_left", "front_right"]:
-                            bounce_angle = math.pi - math.atan2(-dy, dx)
-                            bounce_angle += 0.1 if bounce_angle > 0 else -0.1
-                        elif collision_type in ["top_left", "top_right"]:
-                            bounce_angle = -math.atan2(dy, dx)
-                            bounce_angle += 0.2 if collision_type == "top_right" else -0.2
-                        self.trajectory = self.calculate_trajectory(bounce_speed * 60, bounce_angle, self.arrow_x, self.arrow_y)
-                if self.check_basket_score(self.arrow_x, self.arrow_y):
-                    self.baskets_scored_left += 1
-                if not self.trajectory or self.arrow_y >= HEIGHT:
-                    self.arrow_in_motion = False
-                    self.trajectory = []
-                    self.arrow_x, self.arrow_y = 100, HEIGHT - 100
-                    self.chances_played += 1
-                    self.rim_x = random.randint(200, WIDTH - 200)
-                    if self.chances_played >= 15:
-                        if not self.show_game_over_screen():
-                            running = False
-            self.display_stats()
-            pygame.display.flip()
-            self.clock.tick(60)
-        pygame.quit()
+            if redraw:
+                self.screen.fill(WHITE)
 
-    def display_stats(self):
-        chances_text = self.font.render(f"Chances: {self.chances_played} / 15", True, BLACK)
-        self.screen.blit(chances_text, (10, 10))
+                game_over_text = game_over_font.render("Game Over!", True, BLACK)
+                self.screen.blit(game_over_text, (WIDTH // 2 - game_over_text.get_width() // 2, HEIGHT // 2 - 150))
+
+                left_player_text = stats_font.render(f"{self.player_left_name}: {self.baskets_scored_left}", True, BLACK)
+                self.screen.blit(left_player_text, (WIDTH // 2 - left_player_text.get_width() // 2, HEIGHT // 2 - 50))
+
+                play_again_btn.draw(self.screen, button_font)
+
+                pygame.display.flip()
 
-        score_text = self.font.render(f"Baskets Scored: {self.baskets_scored} / 15", True, BLACK)
-        self.screen.blit(score_text, (10, 40))
+            event = pygame.event.wait()
+            if event.type == pygame.QUIT:
+                return False
+            was_hovered = play_again_btn.is_hovered
+            if play_again_btn.handle_event(event):
+                self.reset_game()
+                return True
+            redraw = play_again_btn.is_hovered != was_hovered
+
+    def handle_event(self, event):
+        return event.type != pygame.QUIT
+
+    def on_basket(self):
+        self.baskets_scored_left += 1
+
+    def update(self):
+        self.sim_time += SIM_STEP * 1000
+        if not self.arrow_in_motion and self.sim_time - self.last_shot_time >= self.shot_delay:
+            self.auto_shoot()
+            self.last_shot_time = self.sim_time
+        self.ball_prev = (self.arrow_x, self.arrow_y)
+        if self.arrow_in_motion and self.trajectory:
+            if self.step_ball():
+                return self.end_of_chance()
+        return True
+
+    def draw(self, alpha):
+        self.draw_court(alpha)
+        self.display_stats()
+        self.present()
+
+    def display_stats(self):
+        self.draw_text('chances', f"Chances: {self.chances_played} / 15", (10, 10))
+        self.draw_text('score', f"Baskets Scored: {self.baskets_scored} / 15", (10, 40))
 
 if __name__ == "__main__":
-    game = AutoGame()
-    game.run()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Let the trained model play the game.")
+    parser.add_argument('--turbo', action='store_true', help="no window, no frame cap; print each game's score")
+    parser.add_argument('--games', type=int, default=1, help="games to play in turbo mode")
+    parser.add_argument('--model', help="model file (default: model.json, then model.pkl)")
+    parser.add_argument('--profile', nargs='?', const=DEFAULT_REPORT, metavar='REPORT',
+                        help="time each frame phase, show an overlay and write a report (default %(const)s)")
+    parser.add_argument('--seed', type=int, help="seed for the rim positions (default: random)")
+    parser.add_argument('--record', metavar='PATH', help="record the seed and every shot to this file")
+    parser.add_argument('--server', nargs='?', const=DEFAULT_ADDRESS, metavar='ADDRESS',
+                        help="ask Inference_server.py for predictions (default %(const)s); falls back to the local model")
+    parser.add_argument('--team', help="team name to ask the server for (default: the --model file name)")
+    args = parser.parse_args()
+    game = AutoGame(turbo=args.turbo, games=args.games, model_file=args.model, profile=args.profile,
+                    seed=args.seed, record=args.record, server=args.server, team=args.team)
+    game.run()
@@ -0,0 +1,94 @@
+import argparse
+import glob
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from Poly_model import load_model
+from Shot_physics import RIM_MIN_X, RIM_MAX_X, SHOTS_PER_GAME, simulate_shots
+
+Z_95 = 1.959963984540054
+
+
+def find_models(teams_dir):
+    # Only converted .json models are loaded automatically; traded pickles are never unpickled here.
+    return {os.path.splitext(os.path.basename(path))[0]: path
+            for path in sorted(glob.glob(os.path.join(teams_dir, '*.json')))}
+
+
+def unconverted_models(teams_dir):
+    converted = find_models(teams_dir)
+    return [path for path in sorted(glob.glob(os.path.join(teams_dir, '*.pkl')))
+            if os.path.splitext(os.path.basename(path))[0] not in converted]
+
+
+def report_unconverted(paths):
+    for path in paths:
+        print(f"Skipping {path}: convert it with python Poly_model.py {path}")
+
+
+def seeded_rim_positions(seed, shots):
+    return np.random.default_rng(seed).integers(RIM_MIN_X, RIM_MAX_X + 1, size=shots)
+
+
+def wilson_interval(made, shots, z=Z_95):
+    if shots == 0:
+        return 0.0, 0.0
+    p = made / shots
+    denominator = 1 + z ** 2 / shots
+    center = (p + z ** 2 / (2 * shots)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / shots + z ** 2 / (4 * shots ** 2)) / denominator
+    return max(center - margin, 0.0), min(center + margin, 1.0)
+
+
+def play_match(name, path, seed, shots):
+    rim_x = seeded_rim_positions(seed, shots)
+    try:
+        speed, angle = load_model(path).predict(rim_x).T
+    except Exception as e:
+        return {'team': name, 'error': f"{e.__class__.__name__}: {e}"}
+    made, _ = simulate_shots(speed, angle, rim_x)
+    made_count = int(made.sum())
+    low, high = wilson_interval(made_count, shots)
+    return {'team': name, 'made': made_count, 'shots': shots, 'make_pct': 100 * made_count / shots,
+            'ci_low': 100 * low, 'ci_high': 100 * high}
+
+
+def run_tournament(models, seed, shots, workers=None):
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(play_match, name, path, seed, shots) for name, path in models.items()]
+        results = [future.result() for future in futures]
+    ranked = sorted((r for r in results if 'error' not in r), key=lambda r: (-r['make_pct'], r['team']))
+    return ranked, [r for r in results if 'error' in r]
+
+
+def print_leaderboard(ranked, errors):
+    print(f"{'#':>3}  {'Team':<20} {'Made':>13} {'Make %':>8}  95% CI")
+    for rank, r in enumerate(ranked, 1):
+        print(f"{rank:>3}  {r['team']:<20} {r['made']:>5} / {r['shots']:<5} {r['make_pct']:>7.1f}%  "
+              f"[{r['ci_low']:.1f}%, {r['ci_high']:.1f}%]")
+    for r in errors:
+        print(f"  -  {r['team']:<20} could not be loaded ({r['error']})")
+
+
+def main():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="Play every model in teams/ against the same seeded rim positions.")
+    parser.add_argument('--teams', default=os.path.join(script_dir, 'teams'))
+    parser.add_argument('--games', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    report_unconverted(unconverted_models(args.teams))
+    models = find_models(args.teams)
+    if not models:
+        parser.error(f"no .json models found in {args.teams}")
+    ranked, errors = run_tournament(models, args.seed, args.games * SHOTS_PER_GAME, args.workers)
+    print_leaderboard(ranked, errors)
+
+
+if __name__ == "__main__":
+    main()
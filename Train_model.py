@@ -0,0 +1,108 @@
+import argparse
+import os
+
+import numpy as np
+
+from Poly_model import PolyModel
+from Shot_log import open_columns
+from Shot_physics import RIM_MIN_X, RIM_MAX_X
+
+CHUNK_SIZE = 65536
+TARGETS = ('speed', 'angle')
+# Rim positions are mapped onto [-1, 1] so high-degree fits stay well conditioned.
+X_OFFSET = (RIM_MIN_X + RIM_MAX_X) / 2
+X_SCALE = (RIM_MAX_X - RIM_MIN_X) / 2
+
+
+class NormalEquations:
+    def __init__(self, degree, made_only=True):
+        self.degree = degree
+        self.made_only = made_only
+        self.xtx = np.zeros((degree + 1, degree + 1))
+        self.xty = np.zeros((degree + 1, len(TARGETS)))
+        self.count = 0
+        self.rows_read = 0
+
+    def features(self, rim_x):
+        x = (np.asarray(rim_x, dtype=np.float64) - X_OFFSET) / X_SCALE
+        return x[:, None] ** np.arange(self.degree + 1)
+
+    def update(self, rim_x, targets):
+        features = self.features(rim_x)
+        self.xtx += features.T @ features
+        self.xty += features.T @ np.asarray(targets, dtype=np.float64)
+        self.count += len(features)
+
+    def consume_log(self, path, chunk_size=CHUNK_SIZE):
+        columns = open_columns(path)
+        rows = len(columns['speed'])
+        if rows < self.rows_read:
+            raise ValueError(f"{path} has {rows} rows but {self.rows_read} were already trained on; use --rebuild")
+        new_rows = rows - self.rows_read
+        for start in range(self.rows_read, rows, chunk_size):
+            chunk = slice(start, min(start + chunk_size, rows))
+            keep = columns['made'][chunk].astype(bool) if self.made_only else slice(None)
+            targets = np.column_stack([columns[name][chunk][keep] for name in TARGETS])
+            self.update(columns['rim_x'][chunk][keep], targets)
+        self.rows_read = rows
+        return new_rows
+
+    def solve(self, degree=None, ridge=0.0):
+        degrees = np.broadcast_to(self.degree if degree is None else degree, (len(TARGETS),))
+        coefficients = np.zeros((len(TARGETS), max(degrees) + 1))
+        for target, target_degree in enumerate(degrees):
+            terms = target_degree + 1
+            xtx = self.xtx[:terms, :terms] + ridge * np.diag([0.0] + [1.0] * target_degree)
+            coefficients[target, :terms] = np.linalg.lstsq(xtx, self.xty[:terms, target], rcond=None)[0]
+        return PolyModel(coefficients, X_OFFSET, X_SCALE, [name.capitalize() for name in TARGETS])
+
+    def save(self, path):
+        tmp_path = path + f'.{os.getpid()}.tmp.npz'
+        np.savez(tmp_path, degree=self.degree, made_only=self.made_only, xtx=self.xtx, xty=self.xty,
+                 count=self.count, rows_read=self.rows_read)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            state = cls(int(data['degree']), bool(data['made_only']))
+            state.xtx, state.xty = data['xtx'], data['xty']
+            state.count, state.rows_read = int(data['count']), int(data['rows_read'])
+        return state
+
+
+def main():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="Incrementally fit the shot model from the shot log.")
+    parser.add_argument('--log', default=os.path.join(script_dir, 'shots'))
+    parser.add_argument('--state', help="saved normal equations; only rows added since the last run are read "
+                                         "(default: next to --output, e.g. model_state.npz)")
+    parser.add_argument('--output', default='model.json')
+    parser.add_argument('--degree', type=int, default=2)
+    parser.add_argument('--ridge', type=float, default=0.0)
+    parser.add_argument('--include-misses', action='store_true', help="train on missed shots as well")
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    parser.add_argument('--rebuild', action='store_true', help="discard the saved state and reread the whole log")
+    args = parser.parse_args()
+
+    if args.state is None:
+        args.state = os.path.splitext(args.output)[0] + '_state.npz'
+    made_only = not args.include_misses
+    state = None
+    if os.path.isfile(args.state) and not args.rebuild:
+        state = NormalEquations.load(args.state)
+        if state.degree != args.degree or state.made_only != made_only:
+            parser.error(f"{args.state} was built with degree {state.degree}, made_only={state.made_only}; use --rebuild")
+    if state is None:
+        state = NormalEquations(args.degree, made_only)
+
+    new_rows = state.consume_log(args.log, args.chunk_size)
+    if state.count <= args.degree:
+        parser.error(f"only {state.count} training shots; need more than {args.degree}")
+    state.save(args.state)
+    state.solve(ridge=args.ridge).save(args.output)
+    print(f"Read {new_rows} new rows; fitted degree {args.degree} on {state.count} shots -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
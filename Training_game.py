@@ -1,25 +1,28 @@
 import pygame
+import argparse
 import math
 import random
-import csv
 import os
+import time
+from collections import deque
+from Profiler import create_profiler, DEFAULT_REPORT
+from Renderer import Renderer
+from Replay import Recorder
+from Shot_log import ShotLog
+from Shot_physics import (WIDTH, HEIGHT, BALL_RADIUS, RIM_RADIUS, RIM_THICKNESS, RIM_HEIGHT, GRAVITY,
+                          POWER_SCALING, MAX_POWER, RIM_Y, RIM_OFFSET, RIM_VERTICAL_OFFSET, RIM_MIN_X, RIM_MAX_X,
+                          Trajectory, rim_bounce, basket_entered)
 
-WIDTH, HEIGHT = 800, 600
-BALL_RADIUS = 20
-RIM_RADIUS = 35
-RIM_THICKNESS = 5
-RIM_HEIGHT = 32
-GRAVITY = 17
-POWER_SCALING = 0.8
-MAX_POWER = 105
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
 RED = (255, 0, 0)
 GREEN = (0, 255, 0)
 ORANGE_YELLOW = (255, 165, 0)
-RIM_Y = HEIGHT - 300
-RIM_OFFSET = 35
-RIM_VERTICAL_OFFSET = 20
+PREV_POSITIONS = 5
+SIM_RATE = 60
+SIM_STEP = 1 / SIM_RATE
+FRAME_RATE = 60
+MAX_FRAME_TIME = 0.1
 
 class Button:
     def __init__(self, x, y, width, height, text, color):
@@ -44,7 +47,19 @@ class Button:
         return False
 
 class Game:
-    def __init__(self):
+    log_shots = True
+
+    player_name = 'human'
+
+    def __init__(self, turbo=False, profile=None, seed=None, record=None):
+        self.turbo = turbo
+        self.profiler = create_profiler(profile, overlay=not turbo)
+        # Rim positions come only from this generator, so a seed reproduces the whole session.
+        self.seed = random.randrange(2 ** 32) if seed is None else seed
+        self.rng = random.Random(self.seed)
+        self.recorder = Recorder(record, self.seed, self.player_name, turbo) if record else None
+        if turbo:
+            os.environ['SDL_VIDEODRIVER'] = 'dummy'
         pygame.init()
         self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
         pygame.display.set_caption("Basketball Game")
@@ -57,9 +72,10 @@ class Game:
         self.ball_image = pygame.image.load(os.path.join(assets_dir, 'ball.png'))
         self.background_image = pygame.image.load(os.path.join(assets_dir, 'background.png'))
         
-        self.hoop_image = pygame.transform.scale(self.hoop_image, (150, 150))
-        self.ball_image = pygame.transform.scale(self.ball_image, (BALL_RADIUS * 2, BALL_RADIUS * 2))
-        self.background_image = pygame.transform.scale(self.background_image, (WIDTH, HEIGHT))
+        self.hoop_image = pygame.transform.scale(self.hoop_image, (150, 150)).convert_alpha()
+        self.ball_image = pygame.transform.scale(self.ball_image, (BALL_RADIUS * 2, BALL_RADIUS * 2)).convert_alpha()
+        self.background_image = pygame.transform.scale(self.background_image, (WIDTH, HEIGHT)).convert()
+        self.renderer = Renderer(self.screen, self.background_image)
 
         self.total_energy = 0
         self.avg_energy = 0
@@ -67,88 +83,45 @@ class Game:
         self.current_angle = 0
         self.drag_start_pos = None
         
-        self.shot_data = []
+        self.shot_log = ShotLog(os.path.join(script_dir, 'shots')) if self.log_shots else None
         self.reset_game()
 
-    def check_rim_collision(self, prev_x, prev_y, ball_x, ball_y):
-        rim_left_x = self.rim_x - RIM_RADIUS + 10
-        rim_right_x = self.rim_x + RIM_RADIUS + 4
-        rim_collision_y = RIM_Y + RIM_VERTICAL_OFFSET
-        moving_right = ball_x > prev_x
-        moving_left = ball_x < prev_x
-        moving_down = ball_y > prev_y
-        if (rim_left_x <= ball_x <= rim_right_x and 
-            abs(ball_y - rim_collision_y) <= BALL_RADIUS and 
-            moving_down):
-            if ball_x < self.rim_x:
-                return True, "top_left"
-            else:
-                return True, "top_right"
-        if rim_collision_y <= ball_y <= rim_collision_y + RIM_HEIGHT * 2:
-            if (abs(ball_x - rim_left_x) <= BALL_RADIUS):
-                if moving_right:
-                    return True, "front_left"
-                elif moving_left:
-                    return True, "back_left"
-            if (abs(ball_x - rim_right_x) <= BALL_RADIUS):
-                if moving_left:
-                    return True, "front_right"
-                elif moving_right:
-                    return True, "back_right"
-        return False, None
+    def check_rim_collision(self, prev_x, prev_y, ball_x, ball_y, velocity, since_bounce=math.inf):
+        return rim_bounce(prev_x, prev_y, ball_x, ball_y, self.rim_x, velocity, since_bounce)
 
     def reset_game(self):
         self.chances_played = 0
         self.baskets_scored = 0
         self.arrow_x, self.arrow_y = 100, HEIGHT - 100
+        self.ball_prev = (self.arrow_x, self.arrow_y)
         self.dragging = False
         self.trajectory = []
         self.arrow_speed = 0
         self.arrow_angle = 0
+        self.arrow_degrees = 0
         self.arrow_in_motion = False
         self.basket_scored_this_chance = False
-        self.rim_x = random.randint(200, WIDTH - 200)
+        self.shot_collision = None
+        self.rim_x = self.rng.randint(RIM_MIN_X, RIM_MAX_X)
         self.game_over = False
-        self.prev_positions = []
-        self.last_bounce_time = 0
-        self.shot_data = []
+        self.prev_positions = deque(maxlen=PREV_POSITIONS)
         self.drag_start_pos = None
         self.current_speed = 0
         self.current_angle = 0
 
     def calculate_trajectory(self, speed, angle, start_x, start_y):
-        trajectory = []
-        time = 0
-        while True:
-            time += 1 / 10
-            x = start_x + speed * math.cos(angle) * time
-            y = start_y - (speed * math.sin(angle) * time - 0.5 * GRAVITY * time ** 2)
-            if y >= HEIGHT or x < 0 or x > WIDTH:
-                break
-            trajectory.append((x, y))
-        return trajectory
+        return Trajectory(speed, angle, start_x, start_y)
 
     def check_basket_score(self, ball_x, ball_y):
         if not self.basket_scored_this_chance:
-            rim_left_x = self.rim_x - RIM_RADIUS
-            rim_right_x = self.rim_x + RIM_RADIUS
-            rim_collision_y = RIM_Y + RIM_VERTICAL_OFFSET
-            
             self.prev_positions.append((ball_x, ball_y))
-            if len(self.prev_positions) > 5:
-                self.prev_positions.pop(0)
 
             if len(self.prev_positions) >= 2:
-                prev_y = self.prev_positions[-2][1]
-                
-                if (rim_left_x + BALL_RADIUS < ball_x < rim_right_x - BALL_RADIUS and
-                    rim_collision_y < ball_y < rim_collision_y + RIM_HEIGHT * 2 and
-                    prev_y < ball_y):
-                    
-                    if ball_y > rim_collision_y + RIM_HEIGHT - BALL_RADIUS:
-                        self.basket_scored_this_chance = True
-                        self.baskets_scored += 1
-                        return True
+                prev_x, prev_y = self.prev_positions[-2]
+                if basket_entered(prev_x, prev_y, ball_x, ball_y, self.rim_x):
+                    self.basket_scored_this_chance = True
+                    self.baskets_scored += 1
+                    return True
             return False
 
     def update_drag_indicators(self, mouse_pos):
@@ -191,142 +164,232 @@ class Game:
 
         pygame.draw.polygon(screen, color, arrow_points)
 
-    def export_shot_data(self):
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        csv_path = os.path.join(script_dir, 'data.csv')
-        file_exists = os.path.isfile(csv_path)
-        with open(csv_path, 'a', newline='') as file:
-            writer = csv.writer(file)
-            if not file_exists:
-                writer.writerow(['Speed', 'Angle', 'Rim_Center_X'])
-            for shot in self.shot_data:
-                speed = round(shot[0], 2)
-                angle = round(shot[1], 2)
-                rim_x = shot[2]
-                writer.writerow([speed, angle, rim_x])
+    def draw_court(self, alpha=1.0):
+        ball_x = self.ball_prev[0] + (self.arrow_x - self.ball_prev[0]) * alpha
+        ball_y = self.ball_prev[1] + (self.arrow_y - self.ball_prev[1]) * alpha
+        ball_rect = self.ball_image.get_rect()
+        ball_rect.centerx = int(ball_x)
+        ball_rect.centery = int(ball_y)
+        self.renderer.draw('ball', self.ball_image, ball_rect)
+        self.draw_hoop()
+
+    def draw_hoop(self):
+        hoop_rect = self.hoop_image.get_rect()
+        hoop_rect.centerx = self.rim_x
+        hoop_rect.centery = RIM_Y + 25
+        self.renderer.draw('hoop', self.hoop_image, hoop_rect)
+
+    def draw_text(self, key, text, pos, color=BLACK):
+        surface = self.renderer.text(self.font, text, color)
+        self.renderer.draw(key, surface, surface.get_rect(topleft=pos))
+
+    def draw_arrow_item(self, start, end, color, arrow_size=10):
+        margin = arrow_size + 2
+        rect = pygame.Rect(min(start[0], end[0]) - margin, min(start[1], end[1]) - margin,
+                           abs(end[0] - start[0]) + 2 * margin, abs(end[1] - start[1]) + 2 * margin)
+        surface = pygame.Surface(rect.size, pygame.SRCALPHA)
+        self.draw_arrow(surface, (start[0] - rect.x, start[1] - rect.y), (end[0] - rect.x, end[1] - rect.y), color, arrow_size)
+        self.renderer.draw('arrow', surface, rect)
 
     def show_game_over_screen(self):
-        self.export_shot_data()
         play_again_btn = Button(WIDTH//2 - 100, HEIGHT//2 + 50, 200, 50, "Play Again", (0, 100, 0))
-        
+
+        redraw = True
         while True:
+            if redraw:
+                self.screen.fill(BLACK)
+                game_over_text = self.font.render("Game Over!", True, WHITE)
+                score_text = self.font.render(f"Baskets Scored: {self.baskets_scored} / 15", True, WHITE)
+
+                self.screen.blit(game_over_text, (WIDTH//2 - game_over_text.get_width()//2, HEIGHT//2 - 50))
+                self.screen.blit(score_text, (WIDTH//2 - score_text.get_width()//2, HEIGHT//2))
+                play_again_btn.draw(self.screen, self.font)
+
+                pygame.display.flip()
+
+            event = pygame.event.wait()
+            if event.type == pygame.QUIT:
+                return False
+            was_hovered = play_again_btn.is_hovered
+            if play_again_btn.handle_event(event):
+                self.reset_game()
+                return True
+            redraw = play_again_btn.is_hovered != was_hovered
+
+    def handle_event(self, event):
+        if event.type == pygame.QUIT:
+            return False
+
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            if math.hypot(event.pos[0] - self.arrow_x, event.pos[1] - self.arrow_y) <= BALL_RADIUS:
+                self.dragging = True
+                self.drag_start_pos = event.pos
+
+        if event.type == pygame.MOUSEBUTTONUP:
+            if self.dragging:
+                self.dragging = False
+                self.drag_start_pos = None
+                if self.current_speed > 0:
+                    self.launch(self.current_speed, self.current_angle)
+        return True
+
+    def launch(self, speed, angle):
+        # angle in degrees. It is kept as given for the shot log and recordings, since
+        # converting back from radians can change the last bit and the replayed shot with it.
+        self.arrow_speed, self.arrow_degrees = speed, angle
+        self.arrow_angle = math.radians(angle)
+        self.trajectory = self.calculate_trajectory(self.arrow_speed, self.arrow_angle, self.arrow_x, self.arrow_y)
+        self.arrow_in_motion = True
+        self.basket_scored_this_chance = False
+        self.shot_collision = None
+        self.prev_positions = deque(maxlen=PREV_POSITIONS)
+
+    def on_basket(self):
+        self.baskets_scored += 1
+
+    def step_ball(self):
+        prev_x, prev_y = self.arrow_x, self.arrow_y
+        velocity = self.trajectory.velocity()
+        # Each bounce starts a new trajectory, so its clock is the time since that bounce.
+        since_bounce = self.trajectory.sample_time if self.shot_collision else math.inf
+        self.arrow_x, self.arrow_y = next(self.trajectory)
+
+        bounce = self.check_rim_collision(prev_x, prev_y, self.arrow_x, self.arrow_y, velocity, since_bounce)
+        if bounce:
+            self.arrow_x, self.arrow_y, vx, vy, collision_type = bounce
+            self.shot_collision = self.shot_collision or collision_type
+            self.trajectory = Trajectory.from_velocity(vx, vy, self.arrow_x, self.arrow_y)
+        if self.check_basket_score(self.arrow_x, self.arrow_y):
+            self.on_basket()
+        if not self.trajectory or self.arrow_y >= HEIGHT:
+            if self.shot_log:
+                self.shot_log.record(self.arrow_speed, self.arrow_degrees, self.rim_x,
+                                     self.basket_scored_this_chance, self.shot_collision)
+            if self.recorder:
+                self.recorder.record(self.rim_x, self.arrow_speed, self.arrow_degrees,
+                                     self.basket_scored_this_chance, self.shot_collision)
+            self.arrow_in_motion = False
+            self.trajectory = []
+            self.arrow_x, self.arrow_y = 100, HEIGHT - 100
+            self.ball_prev = (self.arrow_x, self.arrow_y)
+            self.chances_played += 1
+            self.rim_x = self.rng.randint(RIM_MIN_X, RIM_MAX_X)
+            return True
+        return False
+
+    def play_shot(self, speed, angle, rim_x, rate=1.0):
+        # Animate one shot at rate times the simulation rate (0 = uncapped) outside the
+        # interactive loop; False if the window was closed.
+        self.rim_x = rim_x
+        self.launch(speed, angle)
+        done = False
+        while not done:
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     return False
-                if play_again_btn.handle_event(event):
-                    self.reset_game()
-                    return True
+            self.ball_prev = (self.arrow_x, self.arrow_y)
+            done = self.step_ball()
+            self.draw(1.0)
+            if rate > 0:
+                self.clock.tick(SIM_RATE * rate)
+        return True
+
+    def end_of_chance(self):
+        if self.chances_played >= 15:
+            running = self.show_game_over_screen()
+            self.renderer.invalidate()
+            # Time spent waiting on the game-over screen is not frame time.
+            self.profiler.begin_frame()
+            return running
+        return True
+
+    def update(self):
+        self.ball_prev = (self.arrow_x, self.arrow_y)
+        if self.arrow_in_motion and self.trajectory:
+            if self.step_ball():
+                self.current_speed = 0
+                self.current_angle = 0
+                return self.end_of_chance()
+        return True
+
+    def draw(self, alpha):
+        if self.dragging:
+            mouse_pos = pygame.mouse.get_pos()
+            self.update_drag_indicators(mouse_pos)
+            arrow_color = self.get_arrow_color(self.current_speed)
+            self.draw_arrow_item((self.arrow_x, self.arrow_y), mouse_pos, arrow_color)
+            self.draw_text('speed', f"Speed: {int(self.current_speed)}", (WIDTH - 200, 10))
+            self.draw_text('angle', f"Angle: {int(self.current_angle)}°", (WIDTH - 200, 50))
 
-            self.screen.fill(BLACK)
-            game_over_text = self.font.render("Game Over!", True, WHITE)
-            score_text = self.font.render(f"Baskets Scored: {self.baskets_scored} / 15", True, WHITE)
-            
-            self.screen.blit(game_over_text, (WIDTH//2 - game_over_text.get_width()//2, HEIGHT//2 - 50))
-            self.screen.blit(score_text, (WIDTH//2 - score_text.get_width()//2, HEIGHT//2))
-            play_again_btn.draw(self.screen, self.font)
-            
-            pygame.display.flip()
+        self.draw_court(alpha)
+
+        if not self.arrow_in_motion and self.trajectory:
+            self.renderer.draw('trajectory', *self.renderer.trajectory(self.trajectory.preview(), WHITE))
+
+        self.draw_text('chances', f"Chances: {self.chances_played} / 15", (10, 10))
+        self.draw_text('score', f"Baskets Scored: {self.baskets_scored} / 15", (10, 40))
+
+        self.present()
+
+    def present(self):
+        self.profiler.draw_overlay(self.renderer, self.screen)
+        self.profiler.mark('draw')
+        self.renderer.present()
 
     def run(self):
         running = True
-        
-        while running:
-            mouse_pos = pygame.mouse.get_pos()
-            
-            self.screen.blit(self.background_image, (0, 0))
+        accumulator = 0.0
+        last_time = time.perf_counter()
+        profiler = self.profiler
 
+        while running:
+            profiler.begin_frame()
             for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-
-                if event.type == pygame.MOUSEBUTTONDOWN:
-                    if math.hypot(event.pos[0] - self.arrow_x, event.pos[1] - self.arrow_y) <= BALL_RADIUS:
-                        self.dragging = True
-                        self.drag_start_pos = event.pos
-
-                if event.type == pygame.MOUSEBUTTONUP:
-                    if self.dragging:
-                        self.dragging = False
-                        self.drag_start_pos = None
-                        if self.current_speed > 0:
-                            self.arrow_speed = self.current_speed
-                            self.arrow_angle = math.radians(self.current_angle)
-                            self.trajectory = self.calculate_trajectory(self.arrow_speed, self.arrow_angle, self.arrow_x, self.arrow_y)
-                            self.shot_data.append([self.arrow_speed, self.current_angle, self.rim_x])
-                            self.arrow_in_motion = True
-                            self.basket_scored_this_chance = False
-                            self.prev_positions = []
-                            self.last_bounce_time = 0
-
-            if self.dragging:
-                self.update_drag_indicators(mouse_pos)
-                arrow_color = self.get_arrow_color(self.current_speed)
-                self.draw_arrow(self.screen, (self.arrow_x, self.arrow_y), mouse_pos, arrow_color)
-                speed_text = self.font.render(f"Speed: {int(self.current_speed)}", True, BLACK)
-                angle_text = self.font.render(f"Angle: {int(self.current_angle)}°", True, BLACK)
-                self.screen.blit(speed_text, (WIDTH - 200, 10))
-                self.screen.blit(angle_text, (WIDTH - 200, 50))
-
-            ball_rect = self.ball_image.get_rect()
-            ball_rect.centerx = int(self.arrow_x)
-            ball_rect.centery = int(self.arrow_y)
-            self.screen.blit(self.ball_image, ball_rect)
-
-            hoop_rect = self.hoop_image.get_rect()
-            hoop_rect.centerx = self.rim_x
-            hoop_rect.centery = RIM_Y + 25
-            self.screen.blit(self.hoop_image, hoop_rect)
-
-            if not self.arrow_in_motion and self.trajectory:
-                for point in self.trajectory:
-                    pygame.draw.circle(self.screen, WHITE, (int(point[0]), int(point[1])), 2)
-
-            if self.arrow_in_motion and self.trajectory:
-                prev_x, prev_y = self.arrow_x, self.arrow_y
-                self.arrow_x, self.arrow_y = self.trajectory.pop(0)
-                
-                dx = self.arrow_x - prev_x
-                dy = self.arrow_y - prev_y
-                current_speed = math.hypot(dx, dy)
-                current_time = pygame.time.get_ticks()
-
-                if current_time - self.last_bounce_time > 50:
-                    rim_collision, collision_type = self.check_rim_collision(prev_x, prev_y, self.arrow_x, self.arrow_y)
-                    if rim_collision:
-                        self.last_bounce_time = current_time
-                        bounce_speed = current_speed * 0.15
-                        if collision_type in ["front_left", "front_right"]:
-                            bounce_angle = math.pi - math.atan2(-dy, dx)
-                            bounce_angle += 0.1 if bounce_angle > 0 else -0.1
-                        elif collision_type in ["top_left", "top_right"]:
-                            bounce_angle = -math.atan2(dy, dx)
-                            bounce_angle += 0.2 if collision_type == "top_right" else -0.2
-                        self.trajectory = self.calculate_trajectory(bounce_speed * 60, bounce_angle, self.arrow_x, self.arrow_y)
-                if self.check_basket_score(self.arrow_x, self.arrow_y):
-                    self.baskets_scored += 1
-                if not self.trajectory or self.arrow_y >= HEIGHT:
-                    self.arrow_in_motion = False
-                    self.trajectory = []
-                    self.arrow_x, self.arrow_y = 100, HEIGHT - 100
-                    self.chances_played += 1
-                    self.rim_x = random.randint(200, WIDTH - 200)
-                    self.current_speed = 0
-                    self.current_angle = 0
-                    
-                    if self.chances_played >= 15:
-                        if not self.show_game_over_screen():
-                            running = False
-
-            chances_text = self.font.render(f"Chances: {self.chances_played} / 15", True, BLACK)
-            self.screen.blit(chances_text, (10, 10))
-
-            score_text = self.font.render(f"Baskets Scored: {self.baskets_scored} / 15", True, BLACK)
-            self.screen.blit(score_text, (10, 40))
-
-            pygame.display.flip()
-            self.clock.tick(60)
+                running = self.handle_event(event) and running
+            profiler.mark('events')
+
+            if self.turbo:
+                running = running and self.update()
+                profiler.mark('update')
+                profiler.end_frame()
+                continue
+
+            now = time.perf_counter()
+            accumulator += min(now - last_time, MAX_FRAME_TIME)
+            last_time = now
+            while running and accumulator >= SIM_STEP:
+                running = self.update()
+                accumulator -= SIM_STEP
+            profiler.mark('update')
+
+            if running:
+                self.draw(accumulator / SIM_STEP)
+                profiler.mark('present')
+            self.clock.tick(FRAME_RATE)
+            profiler.mark('idle')
+            profiler.end_frame()
+        if self.shot_log:
+            self.shot_log.close()
+        if self.recorder:
+            self.recorder.close()
+        profiler.close()
         pygame.quit()
 
+
+class PlaybackGame(Game):
+    # Draws shots chosen elsewhere (environments, replays) without logging or double counting.
+    log_shots = False
+
+    def on_basket(self):
+        pass
+
+
 if __name__ == "__main__":
-    game = Game()
+    parser = argparse.ArgumentParser(description="Shoot baskets by hand; every shot goes to the shot log.")
+    parser.add_argument('--profile', nargs='?', const=DEFAULT_REPORT, metavar='REPORT',
+                        help="time each frame phase, show an overlay and write a report (default %(const)s)")
+    parser.add_argument('--seed', type=int, help="seed for the rim positions (default: random)")
+    parser.add_argument('--record', metavar='PATH', help="record the seed and every shot to this file")
+    args = parser.parse_args()
+    game = Game(profile=args.profile, seed=args.seed, record=args.record)
     game.run()
\ No newline at end of file
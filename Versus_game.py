@@ -0,0 +1,157 @@
+import argparse
+import os
+
+import numpy as np
+import pygame
+
+from Poly_model import load_model
+from Profiler import DEFAULT_REPORT
+from Shot_physics import MAX_STEPS, RIM_MIN_X, RIM_MAX_X, SHOTS_PER_GAME, ShotBatch
+from Tournament import find_models, report_unconverted, unconverted_models
+from Training_game import Game, Button, SIM_STEP, WIDTH, HEIGHT, BALL_RADIUS, WHITE, BLACK
+
+TEAM_COLORS = [(230, 25, 75), (60, 180, 75), (0, 130, 200), (245, 130, 48), (145, 30, 180), (70, 240, 240),
+               (240, 50, 230), (210, 245, 60), (0, 128, 128), (170, 110, 40), (128, 0, 0), (0, 0, 128)]
+SCOREBOARD_FONT_SIZE = 24
+SCOREBOARD_ROWS = 12
+
+
+class VersusGame(Game):
+    log_shots = False
+
+    def __init__(self, models, turbo=False, games=1, profile=None, seed=None):
+        self.names = list(models)
+        self.models = [models[name] for name in self.names]
+        self.scores = np.zeros(len(self.names), dtype=np.int64)
+        self.batch = None
+        super().__init__(turbo, profile, seed)
+        self.shot_delay = 0 if turbo else 1000
+        self.sim_time = 0
+        self.last_shot_time = 0
+        self.games = games
+        self.games_played = 0
+        self.scoreboard_font = pygame.font.SysFont(None, SCOREBOARD_FONT_SIZE)
+        # Every team gets the same ball with its colour as a ring, so balls stay easy to tell apart.
+        self.team_balls = []
+        for i in range(len(self.names)):
+            ball = self.ball_image.copy()
+            pygame.draw.circle(ball, TEAM_COLORS[i % len(TEAM_COLORS)], (BALL_RADIUS, BALL_RADIUS), BALL_RADIUS, 3)
+            self.team_balls.append(ball)
+
+    def reset_game(self):
+        super().reset_game()
+        self.scores[:] = 0
+        self.batch = None
+
+    def shoot_all(self):
+        shots = np.array([model.predict(self.rim_x) for model in self.models])
+        self.batch = ShotBatch(shots[:, 0], shots[:, 1], self.rim_x)
+        self.prev_x, self.prev_y = self.batch.x.copy(), self.batch.y.copy()
+        self.arrow_in_motion = True
+
+    def update(self):
+        self.sim_time += SIM_STEP * 1000
+        if self.batch is None:
+            if self.sim_time - self.last_shot_time >= self.shot_delay:
+                self.shoot_all()
+            return True
+        self.prev_x, self.prev_y = self.batch.x.copy(), self.batch.y.copy()
+        # One vectorized step moves every team's ball and checks all of them against the rim.
+        if self.batch.steps < MAX_STEPS and self.batch.step():
+            return True
+        self.scores += self.batch.made
+        self.batch = None
+        self.arrow_in_motion = False
+        self.chances_played += 1
+        self.rim_x = self.rng.randint(RIM_MIN_X, RIM_MAX_X)
+        self.last_shot_time = self.sim_time
+        return self.end_of_chance()
+
+    def standings(self):
+        made = self.scores + (self.batch.made if self.batch is not None else 0)
+        order = sorted(range(len(self.names)), key=lambda i: (-made[i], self.names[i]))
+        return [(i, self.names[i], int(made[i])) for i in order]
+
+    def show_game_over_screen(self):
+        standings = self.standings()
+        if self.turbo:
+            self.games_played += 1
+            print(f"Game {self.games_played}: " + ", ".join(f"{name} {made}" for _, name, made in standings))
+            if self.games_played >= self.games:
+                return False
+            self.reset_game()
+            return True
+
+        play_again_btn = Button(WIDTH // 2 - 100, HEIGHT - 100, 200, 50, "Play Again", (0, 100, 0))
+        redraw = True
+        while True:
+            if redraw:
+                self.screen.fill(WHITE)
+                title = self.font.render("Game Over!", True, BLACK)
+                self.screen.blit(title, (WIDTH // 2 - title.get_width() // 2, 40))
+                for rank, (i, name, made) in enumerate(standings[:SCOREBOARD_ROWS]):
+                    text = self.font.render(f"{rank + 1}. {name}: {made} / {SHOTS_PER_GAME}", True,
+                                            TEAM_COLORS[i % len(TEAM_COLORS)])
+                    self.screen.blit(text, (WIDTH // 2 - text.get_width() // 2, 100 + rank * 36))
+                play_again_btn.draw(self.screen, self.font)
+                pygame.display.flip()
+
+            event = pygame.event.wait()
+            if event.type == pygame.QUIT:
+                return False
+            was_hovered = play_again_btn.is_hovered
+            if play_again_btn.handle_event(event):
+                self.reset_game()
+                return True
+            redraw = play_again_btn.is_hovered != was_hovered
+
+    def handle_event(self, event):
+        return event.type != pygame.QUIT
+
+    def draw(self, alpha):
+        self.draw_hoop()
+        if self.batch is not None:
+            x = self.prev_x + (self.batch.x - self.prev_x) * alpha
+            y = self.prev_y + (self.batch.y - self.prev_y) * alpha
+            for i in np.flatnonzero(self.batch.active):
+                ball = self.team_balls[i]
+                self.renderer.draw(f'ball-{i}', ball, ball.get_rect(center=(int(x[i]), int(y[i]))))
+
+        self.draw_text('chances', f"Chances: {self.chances_played} / {SHOTS_PER_GAME}", (10, 10))
+        for rank, (i, name, made) in enumerate(self.standings()[:SCOREBOARD_ROWS]):
+            surface = self.renderer.text(self.scoreboard_font, f"{name}  {made}", TEAM_COLORS[i % len(TEAM_COLORS)])
+            self.renderer.draw(f'score-{rank}', surface, surface.get_rect(topleft=(10, 45 + rank * SCOREBOARD_FONT_SIZE)))
+        self.present()
+
+
+def load_teams(paths):
+    models = {}
+    for name, path in paths.items():
+        try:
+            models[name] = load_model(path)
+        except Exception as e:
+            print(f"Skipping {name} ({e.__class__.__name__}: {e})")
+    return models
+
+
+def main():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="Every model in teams/ shoots at the same rim, one ball each.")
+    parser.add_argument('--teams', default=os.path.join(script_dir, 'teams'))
+    parser.add_argument('--turbo', action='store_true', help="no window, no frame cap; print each game's standings")
+    parser.add_argument('--games', type=int, default=1, help="games to play in turbo mode")
+    parser.add_argument('--seed', type=int, help="seed for the rim positions (default: random)")
+    parser.add_argument('--profile', nargs='?', const=DEFAULT_REPORT, metavar='REPORT',
+                        help="time each frame phase, show an overlay and write a report (default %(const)s)")
+    args = parser.parse_args()
+
+    report_unconverted(unconverted_models(args.teams))
+    models = load_teams(find_models(args.teams))
+    if not models:
+        parser.error(f"no models could be loaded from {args.teams}")
+    game = VersusGame(models, turbo=args.turbo, games=args.games, profile=args.profile, seed=args.seed)
+    game.run()
+
+
+if __name__ == "__main__":
+    main()
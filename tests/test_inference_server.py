@@ -0,0 +1,102 @@
+import asyncio
+import os
+import shutil
+import socket
+import threading
+import time
+
+import pygame
+import pytest
+
+import Inference_server
+from Inference_server import InferenceClient, InferenceServer, ModelStore
+from Test_model import AutoGame
+
+TEAMS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'teams')
+
+
+def test_model_store_retries_broken_files_only_when_they_change(tmp_path, capsys):
+    shutil.copy(os.path.join(TEAMS_DIR, 'SUNSHINE.json'), tmp_path / 'SUNSHINE.json')
+    (tmp_path / 'SUNSHINE.pkl').touch()
+    (tmp_path / 'broken.json').touch()
+    (tmp_path / 'zine.pkl').touch()
+    store = ModelStore(str(tmp_path))
+    assert set(store.models) == {'SUNSHINE'}
+    out = capsys.readouterr().out
+    assert out.count("Could not load") == 1 and out.count("Skipping") == 1 and "zine.pkl" in out
+
+    store.reload()
+    store.reload()
+    assert capsys.readouterr().out == ""
+
+    os.utime(tmp_path / 'SUNSHINE.json', ns=(0, 1))
+    os.utime(tmp_path / 'broken.json', ns=(0, 1))
+    store.reload()
+    out = capsys.readouterr().out
+    assert "Reloaded SUNSHINE" in out and out.count("Could not load") == 1
+
+
+@pytest.fixture
+def server(tmp_path):
+    teams_dir = tmp_path / 'teams'
+    teams_dir.mkdir()
+    shutil.copy(os.path.join(TEAMS_DIR, 'SUNSHINE.json'), teams_dir / 'SUNSHINE.json')
+    address = str(tmp_path / 'inference.sock')
+    loop = asyncio.new_event_loop()
+    task = loop.create_task(InferenceServer(ModelStore(str(teams_dir))).serve(address))
+
+    def run():
+        try:
+            loop.run_until_complete(task)
+        except asyncio.CancelledError:
+            pass
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    while not os.path.exists(address):
+        time.sleep(0.01)
+    yield address
+    loop.call_soon_threadsafe(task.cancel)
+    thread.join()
+    loop.close()
+
+
+def test_client_predicts_any_shape(server):
+    client = InferenceClient(server)
+    try:
+        assert client.predict('SUNSHINE', []).shape == (0, 2)
+        assert client.predict('SUNSHINE', 300).shape == (2,)
+        assert client.predict('SUNSHINE', [[200, 300, 400]]).shape == (1, 3, 2)
+        with pytest.raises(ValueError, match='unknown team'):
+            client.predict('model', [300])
+    finally:
+        client.close()
+
+
+def test_client_closes_its_socket_when_connect_fails(tmp_path, monkeypatch):
+    sockets = []
+
+    class RecordingSocket(socket.socket):
+        def __init__(self, *args):
+            super().__init__(*args)
+            sockets.append(self)
+
+    monkeypatch.setattr(Inference_server.socket, 'socket', RecordingSocket)
+    with pytest.raises(OSError):
+        InferenceClient(str(tmp_path / 'missing.sock'))
+    assert len(sockets) == 1 and sockets[0].fileno() == -1
+
+
+def test_auto_game_checks_its_team_on_the_server(server, capsys):
+    model_file = os.path.join(TEAMS_DIR, 'SUNSHINE.json')
+    try:
+        game = AutoGame(turbo=True, model_file=model_file, server=server, team='model')
+        assert game.client is None and game.model_l is not None
+        assert "no team 'model' (it serves: SUNSHINE)" in capsys.readouterr().out
+
+        game = AutoGame(turbo=True, model_file=model_file, server=server)
+        assert game.client is not None and game.model_l is None
+        assert game.predict_shot(300).shape == (2,)
+        game.client.close()
+    finally:
+        pygame.quit()
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from Make_index import MakeIndex, build_index, index_axes
+from Shot_physics import simulate_shots
+
+SHOTS = 2000
+
+
+@pytest.fixture(scope='module')
+def index(tmp_path_factory):
+    path = tmp_path_factory.mktemp('index') / 'make_index.bin'
+    return build_index(str(path), speed_step=1, angle_step=2.5, rim_step=50, workers=2)
+
+
+def on_grid(index, shots, seed=0):
+    rng = np.random.default_rng(seed)
+    rims, speeds, angles = index_axes(index.header)
+    return rng.choice(rims, shots), rng.choice(speeds, shots), rng.choice(angles, shots)
+
+
+def test_made_matches_simulate_shots(index):
+    rim_x, speed, angle = on_grid(index, SHOTS)
+    expected, _ = simulate_shots(speed, angle, rim_x)
+    assert (index.made(rim_x, speed, angle) == expected).all()
+    # The same shots with the angle given a turn either way land in the same cells.
+    assert (index.made(rim_x, speed, angle - 360) == expected).all()
+    assert (index.made(rim_x, speed, angle + 720) == expected).all()
+
+
+def test_cell_wraps_angle_and_rejects_outside(index):
+    _, _, angle, inside = index.cell([200, 200, 150, 200], [50, 50, 50, 500], [359, -1, 0, 0])
+    assert angle[:2].tolist() == [0, 0] and inside.tolist() == [True, True, False, False]
+    assert not index.made(150, 50, 60) and not index.made(200, -5, 60)
+
+
+def brute_margin(index, rim_x, speed, angle):
+    # Walk outwards through freshly simulated shots until one misses.
+    h = index.header
+    rim = np.full(h['angle_count'], rim_x)
+    row, _ = simulate_shots(np.full(h['angle_count'], speed), index.angles, rim)
+    column, _ = simulate_shots(index.speeds, np.full(h['speed_count'], angle), rim_x)
+    a, s = int(round(angle / h['angle_step'])), int(round(speed / h['speed_step']))
+    angle_steps = next((d for d in range(1, len(row) // 2 + 1)
+                        if not row[(a + d) % len(row)] or not row[(a - d) % len(row)]), len(row) // 2)
+    speed_steps = next(d for d in range(1, len(column) + 1)
+                       if s + d >= len(column) or s - d < 0 or not column[s + d] or not column[s - d])
+    return (speed_steps - 1) * h['speed_step'], (angle_steps - 1) * h['angle_step']
+
+
+def test_margin_matches_brute_force(index):
+    rim_x, speed, angle = on_grid(index, 20000, seed=1)
+    made = index.made(rim_x, speed, angle)
+    rim_x, speed, angle = rim_x[made][:40], speed[made][:40], angle[made][:40]
+    speed_margin, angle_margin = index.margin(rim_x, speed, angle)
+    for i in range(len(rim_x)):
+        assert (speed_margin[i], angle_margin[i]) == brute_margin(index, rim_x[i], speed[i], angle[i])
+    # A scalar speed and angle broadcast against the rims; missed and off-index shots have no margin.
+    rims = np.array([150, 200, 400, 600])
+    speed_margin, angle_margin = index.margin(rims, 10, 0)
+    assert speed_margin.shape == angle_margin.shape == (4,)
+    assert not index.made(rims, 10, 0).any() and not speed_margin.any() and not angle_margin.any()
@@ -0,0 +1,35 @@
+import os
+
+import numpy as np
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+import pygame
+
+from Replay import find_divergences, read_recording
+from Shot_physics import MAX_POWER, RIM_MIN_X, RIM_MAX_X
+from Training_game import PlaybackGame
+
+SHOTS = 2000
+
+
+def test_recorded_game_replays_exactly(tmp_path):
+    path = tmp_path / 'game.jsonl'
+    rng = np.random.default_rng(0)
+    game = PlaybackGame(seed=0, record=str(path))
+    try:
+        for _ in range(SHOTS):
+            # Shots near the rim edges are the ones a rounding difference would flip.
+            game.rim_x = int(rng.integers(RIM_MIN_X, RIM_MAX_X + 1))
+            game.launch(float(rng.uniform(0, MAX_POWER)), float(rng.uniform(0, 90)))
+            while not game.step_ball():
+                pass
+        game.recorder.close()
+    finally:
+        pygame.quit()
+
+    header, columns = read_recording(str(path))
+    assert header['seed'] == 0 and len(columns['speed']) == SHOTS
+    assert columns['made'].any() and columns['collision'].any()
+    diverged, made, collision = find_divergences(columns)
+    assert len(diverged) == 0
+    assert (made == columns['made']).all() and (collision == columns['collision']).all()
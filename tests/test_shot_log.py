@@ -0,0 +1,35 @@
+from multiprocessing import Process
+
+import numpy as np
+
+from Shot_log import ShotLog, append_columns, init_log, read_shots
+
+
+def game_writer(path, session):
+    log = ShotLog(path, session=session)
+    for _ in range(2000):
+        log.record(session, session, session, True, None)
+    log.close()
+
+
+def bulk_writer(path, session):
+    for i in range(100):
+        n = 7 + i % 5
+        append_columns(path, {'speed': np.full(n, session), 'angle': np.full(n, session), 'rim_x': np.full(n, session),
+                              'made': False, 'collision': 0, 'session': session, 'timestamp': 0.0})
+
+
+def test_concurrent_writers_keep_columns_aligned(tmp_path):
+    path = str(tmp_path / 'shots')
+    init_log(path)
+    writers = [Process(target=game_writer, args=(path, s)) for s in (1, 2)]
+    writers += [Process(target=bulk_writer, args=(path, s)) for s in (3, 4)]
+    for writer in writers:
+        writer.start()
+    for writer in writers:
+        writer.join()
+    shots = read_shots(path)
+    assert len(shots['speed']) == 2 * 2000 + 2 * sum(7 + i % 5 for i in range(100))
+    assert (shots['speed'] == shots['rim_x']).all() and (shots['angle'] == shots['rim_x']).all()
+    assert (shots['session'] == shots['rim_x'].astype(np.uint64)).all()
+    assert (shots['made'] == (shots['session'] < 3)).all()
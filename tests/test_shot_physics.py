@@ -0,0 +1,67 @@
+import math
+import os
+
+import numpy as np
+import pytest
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+import pygame
+
+from Shot_physics import (BALL_RADIUS, COLLISION_TYPES, GRAVITY, MAX_POWER, RIM_MIN_X, RIM_MAX_X, RIM_TOP_Y, rim_bounce,
+                          simulate_shots)
+from Training_game import PlaybackGame
+
+SHOTS = 3000
+
+
+def random_shots(shots, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.uniform(0, MAX_POWER, shots), rng.uniform(0, 90, shots), rng.integers(RIM_MIN_X, RIM_MAX_X + 1, shots)
+
+
+@pytest.fixture(scope='module')
+def game():
+    game = PlaybackGame(seed=0)
+    yield game
+    pygame.quit()
+
+
+def play(game, speed, angle, rim_x):
+    # Game.play_shot without the window: step the ball until the shot is over.
+    game.rim_x = rim_x
+    game.launch(speed, angle)
+    while not game.step_ball():
+        pass
+    return game.basket_scored_this_chance, game.shot_collision
+
+
+def test_game_matches_simulate_shots(game):
+    speed, angle, rim_x = random_shots(SHOTS)
+    made, collision = simulate_shots(speed, angle, rim_x)
+    assert made.sum() > 0
+    for i in range(SHOTS):
+        assert play(game, speed[i], angle[i], int(rim_x[i])) == (made[i], COLLISION_TYPES[collision[i]]), i
+
+
+def test_outcomes_do_not_depend_on_step_size():
+    speed, angle, rim_x = random_shots(100000, seed=1)
+    made, _ = simulate_shots(speed, angle, rim_x)
+    for time_step in (0.05, 0.2):
+        stepped, _ = simulate_shots(speed, angle, rim_x, time_step=time_step, max_steps=int(200 / time_step))
+        assert abs(int(stepped.sum()) - int(made.sum())) <= 0.05 * made.sum()
+        assert (stepped != made).mean() < 0.001
+
+
+def test_top_band_deflects_a_falling_ball():
+    rim_x = 400
+    x, y, vx, vy, collision = rim_bounce(rim_x + 10, RIM_TOP_Y - 40, rim_x + 10, RIM_TOP_Y, rim_x, (0.0, -50.0))
+    assert (x, y, collision) == (rim_x + 10, RIM_TOP_Y - BALL_RADIUS, 'top_right')
+    assert math.hypot(vx, vy) == pytest.approx(0.9 * (50 + GRAVITY * 0.05))
+    assert math.atan2(vy, vx) == pytest.approx(-math.pi / 2 + 0.2)
+
+
+def test_rim_is_ignored_right_after_a_bounce():
+    rim_x = 400
+    segment = (rim_x + 10, RIM_TOP_Y - 40, rim_x + 10, RIM_TOP_Y, rim_x, (0.0, -50.0))
+    assert rim_bounce(*segment, since_bounce=0.1) is None
+    assert rim_bounce(*segment, since_bounce=1.0) is not None
@@ -0,0 +1,29 @@
+import numpy as np
+
+from Shot_physics import RIM_MIN_X, RIM_MAX_X, simulate_shots
+from Shot_solver import best_shot, speed_range
+
+
+def test_every_solved_rim_scores():
+    rims = np.arange(RIM_MIN_X, RIM_MAX_X + 1)
+    speed, angle, margin = best_shot(rims)
+    solved = np.isfinite(speed)
+    assert solved[rims <= 500].all()
+    assert np.isnan(angle[~solved]).all() and np.isnan(margin[~solved]).all()
+    made, _ = simulate_shots(speed[solved], angle[solved], rims[solved])
+    assert made.all()
+
+
+def test_speed_range_mostly_scores():
+    for rim_x in (200, 350, 480):
+        _, angle, _ = best_shot([rim_x])
+        low, high = speed_range(angle[0], rim_x)
+        made, _ = simulate_shots(np.linspace(low, high, 101), angle[0], rim_x)
+        assert made.mean() > 0.8
+
+
+def test_infeasible_shot_is_nan():
+    low, high = speed_range([60, 89], [200, 200])
+    assert np.isnan(low).all() and np.isnan(high).all()
+    speed, angle, margin = best_shot([RIM_MAX_X])
+    assert np.isnan(speed).all() and np.isnan(angle).all() and np.isnan(margin).all()
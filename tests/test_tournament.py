@@ -0,0 +1,9 @@
+from Tournament import find_models, unconverted_models
+
+
+def test_find_models_never_returns_pickles(tmp_path):
+    for name in ('SUNSHINE.pkl', 'SUNSHINE.json', 'zine.pkl', 'new.json'):
+        (tmp_path / name).touch()
+    assert find_models(str(tmp_path)) == {'SUNSHINE': str(tmp_path / 'SUNSHINE.json'),
+                                          'new': str(tmp_path / 'new.json')}
+    assert unconverted_models(str(tmp_path)) == [str(tmp_path / 'zine.pkl')]
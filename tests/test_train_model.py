@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from Shot_log import append_columns, init_log
+from Train_model import NormalEquations
+
+
+def append_shots(path, shots, seed):
+    rng = np.random.default_rng(seed)
+    rim_x = rng.integers(200, 601, shots)
+    append_columns(path, {'speed': 60 + rim_x / 10 + rng.normal(0, 1, shots), 'angle': 50 + rng.normal(0, 1, shots),
+                          'rim_x': rim_x, 'made': rng.random(shots) < 0.7, 'collision': 0, 'session': seed,
+                          'timestamp': 0.0})
+
+
+def test_incremental_training_matches_a_full_run(tmp_path):
+    log = str(tmp_path / 'shots')
+    init_log(log)
+    append_shots(log, 5000, seed=1)
+    state = NormalEquations(3)
+    assert state.consume_log(log, chunk_size=777) == 5000
+    state.save(str(tmp_path / 'state.npz'))
+
+    append_shots(log, 3000, seed=2)
+    state = NormalEquations.load(str(tmp_path / 'state.npz'))
+    assert state.consume_log(log, chunk_size=777) == 3000
+    full = NormalEquations(3)
+    full.consume_log(log)
+
+    assert state.count == full.count and state.rows_read == full.rows_read == 8000
+    np.testing.assert_allclose(state.xtx, full.xtx, rtol=1e-12)
+    rim_x = np.arange(200, 601)
+    np.testing.assert_allclose(state.solve().predict(rim_x), full.solve().predict(rim_x), atol=1e-9)
+
+
+def test_shrunken_log_asks_for_rebuild(tmp_path):
+    log = str(tmp_path / 'shots')
+    init_log(log)
+    append_shots(log, 100, seed=1)
+    state = NormalEquations(2)
+    state.rows_read = 200
+    with pytest.raises(ValueError, match="--rebuild"):
+        state.consume_log(log)